@@ -5,8 +5,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List
 
 
 def value(n: int) -> int:
@@ -34,16 +35,20 @@ def main() -> int:
     if args.limit < 1:
         print("ERROR: --limit must be >= 1")
         return 1
-    pairs: List[Tuple[int, int]] = [(n, value(n)) for n in range(1, args.limit + 1)]
-    payload = {
-        "series": [{"n": n, "value": v} for n, v in pairs],
-        "values": [v for _, v in pairs],
-    }
-    output = json.dumps(payload, indent=2) + "\n"
+    series: List[Dict[str, int]] = []
+    values: List[int] = []
+    for n in range(1, args.limit + 1):
+        v = value(n)
+        series.append({"n": n, "value": v})
+        values.append(v)
+    payload = {"series": series, "values": values}
     if args.output:
-        Path(args.output).write_text(output, encoding="utf-8")
+        with Path(args.output).open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
     else:
-        print(output.rstrip())
+        json.dump(payload, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     return 0
 
 
@@ -5,23 +5,39 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import hashlib
 import html
-import json
 import re
 import subprocess
 import sys
 import textwrap
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
-from urllib.request import urlopen
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-import formalizer_loop
-import lean_search
-import literature_scout
-import semantic_audit
-import solver_autoplan
-import solver_scaffold
+import http_client
+import json_utils
+import llm_utils
+
+PROBLEM_ID_PATTERN = re.compile(r"[Pp]?(\d+)")
+CONTENT_PATTERN = re.compile(r'<div id="content"[^>]*>(.*?)</div>', re.S)
+MARKUP_PATTERN = re.compile(r"(<br\s*/?>)|<[^>]+>", re.I)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+LEAN_HREF_PATTERN = re.compile(r'href="([^"]+\.lean)"')
+ADD_BOX_PATTERN = re.compile(r"addNewBox\('([^']+)'")
+CITE_PATTERN = re.compile(r"#cite-([A-Za-z0-9_-]+)")
+FETCH_TIMEOUT = 30
+FETCH_HEADERS = {"Accept-Encoding": "gzip", "User-Agent": "ErdosLab auto_problem"}
+
+
+@functools.lru_cache(maxsize=128)
+def lean_link_pattern(number: int) -> re.Pattern[str]:
+    return re.compile(rf"erdos[_-]?{number}\.lean")
+
+
+@functools.lru_cache(maxsize=128)
+def theorem_pattern(number: int) -> re.Pattern[str]:
+    return re.compile(rf"\btheorem\s+(erdos[_-]?{number})\b")
 
 
 def parse_args() -> argparse.Namespace:
@@ -91,8 +107,9 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_problem_id(raw: str) -> Tuple[str, int]:
-    match = re.fullmatch(r"[Pp]?(\d+)", raw.strip())
+    match = PROBLEM_ID_PATTERN.fullmatch(raw.strip())
     if not match:
         raise ValueError(f"Invalid problem id: {raw!r}")
     number_str = match.group(1)
@@ -101,26 +118,47 @@ def normalize_problem_id(raw: str) -> Tuple[str, int]:
     return f"P{number:0{width}d}", number
 
 
+def fetch_bytes(url: str, with_hash: bool = False) -> Tuple[bytes, Optional[str]]:
+    return http_client.fetch(
+        url, headers=FETCH_HEADERS, timeout=FETCH_TIMEOUT, with_hash=with_hash
+    )
+
+
 def fetch_url(url: str) -> Tuple[bytes, str]:
-    with urlopen(url) as response:
-        data = response.read()
-    text = data.decode("utf-8", errors="replace")
-    return data, text
+    data, _ = fetch_bytes(url)
+    return data, data.decode("utf-8", errors="replace")
+
+
+def fetch_url_hashed(url: str) -> Tuple[bytes, str, str]:
+    data, sha256 = fetch_bytes(url, with_hash=True)
+    sha256 = sha256 or hashlib.sha256(data).hexdigest()
+    return data, data.decode("utf-8", errors="replace"), sha256
 
 
 def extract_statement(html_text: str) -> Tuple[Optional[str], Optional[str]]:
-    match = re.search(r'<div id="content"[^>]*>(.*?)</div>', html_text, re.S)
+    match = CONTENT_PATTERN.search(html_text)
     if not match:
         return None, None
     raw_html = match.group(1).strip()
-    text = html.unescape(raw_html)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.I)
-    text = re.sub(r"<[^>]+>", "", text)
-    return raw_html, text.strip()
+    return raw_html, strip_markup(raw_html).strip()
+
+
+def strip_markup(raw_html: str) -> str:
+    # One scan: split() alternates text segments with the captured <br> group
+    # (None for any other tag), so entities are unescaped only in text and an
+    # escaped "&lt;" can never be mistaken for the start of a tag.
+    pieces = MARKUP_PATTERN.split(raw_html)
+    parts = []
+    for idx, piece in enumerate(pieces):
+        if idx % 2 == 0:
+            parts.append(html.unescape(piece))
+        elif piece:
+            parts.append("\n")
+    return "".join(parts)
 
 
 def extract_lean_links(html_text: str) -> list[str]:
-    links = re.findall(r'href="([^"]+\.lean)"', html_text)
+    links = LEAN_HREF_PATTERN.findall(html_text)
     cleaned = [html.unescape(link) for link in links]
     seen = set()
     unique = []
@@ -132,19 +170,23 @@ def extract_lean_links(html_text: str) -> list[str]:
 
 
 def find_cite_key(html_text: str) -> Optional[str]:
-    match = re.search(r"addNewBox\('([^']+)'", html_text)
-    if match:
-        return match.group(1)
-    match = re.search(r"#cite-([A-Za-z0-9_-]+)", html_text)
-    if match:
-        return match.group(1)
+    # Plain substring probes are much cheaper than a regex scan of the whole
+    # page, and most pages lack at least one of the two markers.
+    if "addNewBox(" in html_text:
+        match = ADD_BOX_PATTERN.search(html_text)
+        if match:
+            return match.group(1)
+    if "#cite-" in html_text:
+        match = CITE_PATTERN.search(html_text)
+        if match:
+            return match.group(1)
     return None
 
 
 def pick_lean_links(links: Iterable[str], number: int) -> Tuple[Optional[str], Optional[str]]:
     proof = None
     statement = None
-    pattern = re.compile(rf"erdos[_-]?{number}\.lean")
+    pattern = lean_link_pattern(number)
     for link in links:
         if "FormalConjectures/ErdosProblems" in link:
             statement = link
@@ -156,7 +198,7 @@ def pick_lean_links(links: Iterable[str], number: int) -> Tuple[Optional[str], O
 
 
 def find_theorem_name(text: str, number: int) -> Optional[str]:
-    match = re.search(rf"\btheorem\s+(erdos[_-]?{number})\b", text)
+    match = theorem_pattern(number).search(text)
     if match:
         return match.group(1)
     return None
@@ -185,9 +227,24 @@ def write_text(path: Path, content: str) -> None:
     path.write_text(content.rstrip() + "\n", encoding="utf-8")
 
 
-def write_if_missing(path: Path, content: str) -> None:
-    if not path.exists():
-        write_text(path, content)
+FROZEN_TEMPLATE = textwrap.dedent(
+    """\
+    # Erdos Problem #{number} (frozen_v1)
+
+    ## Source
+    - {problem_url} (accessed {accessed})
+    {hash_line}
+
+    ## Definitions
+    - None.
+
+    ## Statement
+    {statement}
+
+    ## Edge cases
+    - None.
+    """
+)
 
 
 def render_frozen_statement(
@@ -207,23 +264,12 @@ def render_frozen_statement(
         hash_line = "- latex snapshot: unavailable\n"
 
     statement = statement_text or "TBD (fetch the statement from the source URL)."
-    return textwrap.dedent(
-        f"""\
-        # Erdos Problem #{number} (frozen_v1)
-
-        ## Source
-        - {problem_url} (accessed {accessed})
-        {hash_line.rstrip()}
-
-        ## Definitions
-        - None.
-
-        ## Statement
-        {statement}
-
-        ## Edge cases
-        - None.
-        """
+    return FROZEN_TEMPLATE.format(
+        number=number,
+        problem_url=problem_url,
+        accessed=accessed,
+        hash_line=hash_line.rstrip(),
+        statement=statement,
     )
 
 
@@ -284,81 +330,128 @@ def render_primary_sources(
     return "\n".join(lines) + "\n"
 
 
+MAPPING_TEMPLATE = textwrap.dedent(
+    """\
+    # Literature Mapping
+
+    - TODO: map primary sources to proof steps.
+    """
+)
+
+
 def render_mapping() -> str:
-    return textwrap.dedent(
-        """\
-        # Literature Mapping
+    return MAPPING_TEMPLATE
 
-        - TODO: map primary sources to proof steps.
-        """
-    )
+
+BLUEPRINT_TEMPLATE = textwrap.dedent(
+    """\
+    # Blueprint
+
+    ## Goal theorem
+    - See frozen statement.
+
+    ## Lemmas (expected)
+    1) TODO
+    2) TODO
+    3) TODO
+
+    ## Notes
+    - TODO
+    """
+)
 
 
 def render_blueprint() -> str:
-    return textwrap.dedent(
-        """\
-        # Blueprint
+    return BLUEPRINT_TEMPLATE
 
-        ## Goal theorem
-        - See frozen statement.
 
-        ## Lemmas (expected)
-        1) TODO
-        2) TODO
-        3) TODO
+PROCESS_LOG_TEMPLATE = textwrap.dedent(
+    """\
+    # Process Log
 
-        ## Notes
-        - TODO
-        """
-    )
+    Use this log to track progress, failed attempts, and decisions.
+
+    Format (one entry per line):
+    - YYYY-MM-DD: action / result / notes
+    """
+)
 
 
 def render_process_log() -> str:
-    return textwrap.dedent(
-        """\
-        # Process Log
+    return PROCESS_LOG_TEMPLATE
 
-        Use this log to track progress, failed attempts, and decisions.
 
-        Format (one entry per line):
-        - YYYY-MM-DD: action / result / notes
-        """
-    )
+AI_USAGE_TEMPLATE = textwrap.dedent(
+    """\
+    # AI Usage
+
+    Record which tools/models were used and what they contributed.
+
+    Checklist:
+    - [ ] Literature scout used (sources, date, notes)
+    - [ ] Manual LLM used (model, prompt location, scope)
+    - [ ] Lean formalizer assistance (model, files)
+    - [ ] Compute experiments (scripts, parameters)
+
+    Notes:
+    - 
+    """
+)
 
 
 def render_ai_usage() -> str:
-    return textwrap.dedent(
-        """\
-        # AI Usage
+    return AI_USAGE_TEMPLATE
 
-        Record which tools/models were used and what they contributed.
 
-        Checklist:
-        - [ ] Literature scout used (sources, date, notes)
-        - [ ] Manual LLM used (model, prompt location, scope)
-        - [ ] Lean formalizer assistance (model, files)
-        - [ ] Compute experiments (scripts, parameters)
+EXPOSITION_TEMPLATE = textwrap.dedent(
+    """\
+    # Exposition (Human-Readable)
 
-        Notes:
-        - 
-        """
-    )
+    Summarize the proof idea in plain language after formal verification.
+
+    Sections to include:
+    - Statement (short)
+    - Key ideas
+    - Main lemmas
+    - Why the proof works
+    """
+)
 
 
 def render_exposition() -> str:
-    return textwrap.dedent(
-        """\
-        # Exposition (Human-Readable)
-
-        Summarize the proof idea in plain language after formal verification.
-
-        Sections to include:
-        - Statement (short)
-        - Key ideas
-        - Main lemmas
-        - Why the proof works
-        """
-    )
+    return EXPOSITION_TEMPLATE
+
+
+FORUM_POST_TEMPLATE = textwrap.dedent(
+    """\
+    # Forum post draft: Erdos Problem #{number}
+
+    Status:
+    - claim.state: {claim_state}
+    - repo commit: {commit_line}
+
+    Sources:
+    - problem page: {problem_url} (accessed {accessed})
+    - forum thread: {forum_url}
+    - latex snapshot: {latex_line}
+
+    Statement (from frozen_v1):
+    {statement}
+
+    Evidence:
+    - Lean file: {lean_file_line}
+    - Lean source: {lean_source_line}
+    - theorem: {theorem_line}
+    - reproducible build: `bash tools/check.sh`
+    - policy check: `python3 tools/policy/check_repo.py`
+
+    Manual checklist before posting:
+    - [ ] Statement matches frozen_v1 (compare hash if available).
+    - [ ] Bibliography verified (replace NO VERIFICADO).
+    - [ ] Lean proof corresponds to the frozen statement.
+    - [ ] CI green for the PR.
+    """
+)
 
 
 def render_forum_post(
@@ -383,35 +476,18 @@ def render_forum_post(
     lean_source_line = lean_url or "none"
     theorem_line = theorem_name or "unknown"
     commit_line = commit_sha or "unknown"
-    return textwrap.dedent(
-        f"""\
-        # Forum post draft: Erdos Problem #{number}
-
-        Status:
-        - claim.state: {claim_state}
-        - repo commit: {commit_line}
-
-        Sources:
-        - problem page: {problem_url} (accessed {accessed})
-        - forum thread: {forum_url}
-        - latex snapshot: {latex_line}
-
-        Statement (from frozen_v1):
-        {statement}
-
-        Evidence:
-        - Lean file: {lean_file_line}
-        - Lean source: {lean_source_line}
-        - theorem: {theorem_line}
-        - reproducible build: `bash tools/check.sh`
-        - policy check: `python3 tools/policy/check_repo.py`
-
-        Manual checklist before posting:
-        - [ ] Statement matches frozen_v1 (compare hash if available).
-        - [ ] Bibliography verified (replace NO VERIFICADO).
-        - [ ] Lean proof corresponds to the frozen statement.
-        - [ ] CI green for the PR.
-        """
+    return FORUM_POST_TEMPLATE.format(
+        number=number,
+        claim_state=claim_state,
+        commit_line=commit_line,
+        problem_url=problem_url,
+        accessed=accessed,
+        forum_url=forum_url,
+        latex_line=latex_line,
+        statement=statement,
+        lean_file_line=lean_file_line,
+        lean_source_line=lean_source_line,
+        theorem_line=theorem_line,
     )
 
 
@@ -430,7 +506,7 @@ def main() -> int:
     accessed = dt.date.today().isoformat()
 
     problem_dir = root / "problems" / problem_id
-    if not problem_dir.exists() or not args.resume:
+    if not args.resume or not problem_dir.is_dir():
         run(
             [
                 sys.executable,
@@ -457,12 +533,11 @@ def main() -> int:
 
     if not args.no_fetch:
         try:
-            latex_bytes, latex_html = fetch_url(latex_url)
+            latex_bytes, latex_html, latex_hash = fetch_url_hashed(latex_url)
         except Exception as exc:
             print(f"ERROR: failed to fetch LaTeX URL: {latex_url}\n{exc}")
             return 1
 
-        latex_hash = hashlib.sha256(latex_bytes).hexdigest()
         statement_raw_html, statement_text = extract_statement(latex_html)
 
         if statement_raw_html:
@@ -478,7 +553,7 @@ def main() -> int:
             bib_url = f"https://www.erdosproblems.com/bibs/{cite_key}"
             try:
                 _, bib_html = fetch_url(bib_url)
-                bib_entry = html.unescape(re.sub(r"<[^>]+>", "", bib_html)).strip()
+                bib_entry = html.unescape(TAG_PATTERN.sub("", bib_html)).strip()
             except Exception as exc:
                 print(f"WARNING: failed to fetch bib entry {bib_url}: {exc}")
 
@@ -491,28 +566,32 @@ def main() -> int:
 
     if not args.no_lean and lean_url:
         lean_path = root / "ErdosLab" / "Problems" / f"{problem_id}.lean"
-        if lean_path.exists() and not args.force:
+        lean_text: Optional[str] = None
+        if not args.force:
             try:
                 lean_text = lean_path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                lean_text = None
             except Exception as exc:
                 print(f"ERROR: failed to read existing Lean file: {lean_path}\n{exc}")
                 return 1
-            lean_imported = True
-        else:
+        if lean_text is None:
             try:
                 lean_bytes, lean_text = fetch_url(lean_url)
             except Exception as exc:
                 print(f"ERROR: failed to fetch Lean file: {lean_url}\n{exc}")
                 return 1
             lean_path.write_bytes(lean_bytes)
-            lean_imported = True
+        lean_imported = True
 
         all_path = root / "ErdosLab" / "All.lean"
         import_line = f"import ErdosLab.Problems.{problem_id}"
-        all_lines = all_path.read_text(encoding="utf-8").splitlines()
-        if import_line not in all_lines:
-            all_lines.append(import_line)
-            write_text(all_path, "\n".join(all_lines))
+        with all_path.open("r+", encoding="utf-8") as handle:
+            content = handle.read()
+            if import_line not in content.splitlines():
+                if content and not content.endswith("\n"):
+                    handle.write("\n")
+                handle.write(import_line + "\n")
 
         if theorem_name is None:
             theorem_name = find_theorem_name(lean_text, number)
@@ -549,9 +628,9 @@ def main() -> int:
             evidence_note,
         ),
     )
-    write_if_missing(report_dir / "process_log.md", render_process_log())
-    write_if_missing(report_dir / "ai_usage.md", render_ai_usage())
-    write_if_missing(report_dir / "exposition.md", render_exposition())
+    llm_utils.write_new(report_dir / "process_log.md", render_process_log().rstrip() + "\n")
+    llm_utils.write_new(report_dir / "ai_usage.md", render_ai_usage().rstrip() + "\n")
+    llm_utils.write_new(report_dir / "exposition.md", render_exposition().rstrip() + "\n")
     write_text(
         literature_dir / "primary_sources.md",
         render_primary_sources(
@@ -566,9 +645,16 @@ def main() -> int:
     )
     write_text(literature_dir / "mapping.md", render_mapping())
 
-    blueprint_path = problem_dir / "blueprint.md"
-    if not blueprint_path.exists():
-        write_text(blueprint_path, render_blueprint())
+    llm_utils.write_new(problem_dir / "blueprint.md", render_blueprint().rstrip() + "\n")
+
+    # The scaffolding helpers (and what they import) are only needed once the
+    # problem files are in place; importing them here keeps early exits cheap.
+    import formalizer_loop
+    import lean_search
+    import literature_scout
+    import semantic_audit
+    import solver_autoplan
+    import solver_scaffold
 
     prompt_text = literature_scout.render_chatgpt_prompt(
         problem_id=problem_id,
@@ -647,23 +733,24 @@ def main() -> int:
     if not args.skip_checks:
         run(["bash", "tools/check.sh"], root)
 
+    status_path = problem_dir / "status.json"
+    status_data: Optional[Dict[str, Any]] = None
     if lean_imported and theorem_name:
-        status_path = problem_dir / "status.json"
-        data = json.loads(status_path.read_text(encoding="utf-8"))
-        data["claim"]["state"] = "solved"
-        data["evidence"] = [
+        status_data = json_utils.loads_json(status_path.read_bytes())
+        status_data["claim"]["state"] = "solved"
+        status_data["evidence"] = [
             {
                 "type": "lean",
                 "file": f"ErdosLab/Problems/{problem_id}.lean",
                 "theorem": theorem_name,
             }
         ]
-        write_text(status_path, json.dumps(data, indent=2, sort_keys=False))
+        json_utils.write_json(status_path, status_data)
         if not args.skip_checks:
             run([sys.executable, "tools/policy/check_repo.py"], root)
 
-    status_path = problem_dir / "status.json"
-    status_data = json.loads(status_path.read_text(encoding="utf-8"))
+    if status_data is None:
+        status_data = json_utils.loads_json(status_path.read_bytes())
     claim_state = status_data.get("claim", {}).get("state", "partial")
 
     if not args.no_forum:
@@ -4,21 +4,21 @@
 from __future__ import annotations
 
 import argparse
-import datetime as dt
-import json
+import concurrent.futures
+import contextlib
 import os
 import shlex
 import subprocess
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import json_utils
 import solver_scaffold
 
 
 def now_iso() -> str:
-    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds").replace(
-        "+00:00", "Z"
-    )
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def parse_args() -> argparse.Namespace:
@@ -46,20 +46,68 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print commands without executing.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write all results to a single results.jsonl instead of per-experiment dirs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of experiments to run in parallel (default: 1).",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 
-def load_manifest(path: Path) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+def load_manifest(
+    path: Path, only: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     if not path.exists():
         return [], f"manifest not found: {path}"
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json_utils.loads_json(path.read_bytes())
     except Exception as exc:
         return [], f"invalid JSON: {exc}"
-    experiments = payload.get("experiments")
+    experiments = payload.get("experiments") if isinstance(payload, dict) else None
     if not isinstance(experiments, list):
         return [], "manifest missing experiments list"
-    return experiments, None
+
+    errors: List[str] = []
+    selected: List[Dict[str, Any]] = []
+    seen_dirs: Dict[str, int] = {}
+    for idx, exp in enumerate(experiments):
+        # --only selects before validating: other entries are not run, so
+        # their problems should not block the one that was asked for.
+        if only and not (isinstance(exp, dict) and exp.get("name") == only):
+            continue
+        if not isinstance(exp, dict):
+            errors.append(f"experiments[{idx}] must be an object")
+            continue
+        if normalize_command(exp.get("command")) is None:
+            errors.append(f"experiments[{idx}].command must be a list or string")
+        env = exp.get("env")
+        if env is not None and not (
+            isinstance(env, dict) and all(isinstance(v, str) for v in env.values())
+        ):
+            errors.append(f"experiments[{idx}].env must map names to strings")
+        # Each experiment writes to output_dir / safe_name(name); two names that
+        # map to the same directory would overwrite each other's output.
+        dir_name = safe_name(str(exp.get("name") or "experiment"))
+        if dir_name in seen_dirs:
+            errors.append(
+                f"experiments[{idx}].name maps to the same directory as "
+                f"experiments[{seen_dirs[dir_name]}] ({dir_name})"
+            )
+        else:
+            seen_dirs[dir_name] = idx
+        selected.append(exp)
+    if errors:
+        return [], "invalid manifest:\n" + "\n".join(f"  - {err}" for err in errors)
+    return selected, None
 
 
 def normalize_command(command: Any) -> Optional[List[str]]:
@@ -70,8 +118,21 @@ def normalize_command(command: Any) -> Optional[List[str]]:
     return None
 
 
+class SafeNameTable(dict):
+    # str.translate table; entries are filled on first lookup so non-ASCII
+    # characters follow the same isalnum() rule as ASCII ones.
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        mapped = char if char.isalnum() or char in "_-" else "_"
+        self[codepoint] = mapped
+        return mapped
+
+
+SAFE_NAME_TABLE = SafeNameTable()
+
+
 def safe_name(name: str) -> str:
-    return "".join(ch if ch.isalnum() or ch in {"_", "-"} else "_" for ch in name)
+    return name.translate(SAFE_NAME_TABLE)
 
 
 def log_event(root: Path, message: str) -> None:
@@ -83,22 +144,23 @@ def log_event(root: Path, message: str) -> None:
         handle.write(f"[{timestamp}] {message}\n")
 
 
+def decode_output(output: Any) -> str:
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output or ""
+
+
 def run_experiment(
     *,
     root: Path,
     exp: Dict[str, Any],
     output_dir: Path,
     dry_run: bool,
+    compact: bool = False,
 ) -> Tuple[bool, Dict[str, Any]]:
     name = str(exp.get("name") or "experiment")
-    command = normalize_command(exp.get("command"))
+    command = normalize_command(exp["command"])
     timeout = exp.get("timeout_sec")
-    if command is None:
-        return False, {
-            "name": name,
-            "status": "invalid",
-            "error": "command must be a list or string",
-        }
 
     metadata: Dict[str, Any] = {
         "name": name,
@@ -106,45 +168,54 @@ def run_experiment(
         "status": "pending",
         "started_at": now_iso(),
     }
+    # In compact mode no per-experiment directory is created: output is kept
+    # in metadata and main() writes everything to a single results.jsonl.
     exp_dir = output_dir / safe_name(name)
-    exp_dir.mkdir(parents=True, exist_ok=True)
+    if not compact:
+        exp_dir.mkdir(parents=True, exist_ok=True)
 
     if dry_run:
         metadata["status"] = "dry-run"
         metadata["exit_code"] = None
         metadata["finished_at"] = now_iso()
-        (exp_dir / "metadata.json").write_text(
-            json.dumps(metadata, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-        )
+        if not compact:
+            json_utils.write_json(exp_dir / "metadata.json", metadata)
         return True, metadata
 
+    run_kwargs: Dict[str, Any] = {
+        "cwd": root,
+        "timeout": timeout if isinstance(timeout, (int, float)) else None,
+        "check": False,
+        "env": {**os.environ, **(exp.get("env") or {})},
+    }
     try:
-        result = subprocess.run(
-            command,
-            cwd=root,
-            capture_output=True,
-            text=True,
-            timeout=timeout if isinstance(timeout, (int, float)) else None,
-            check=False,
-            env={**os.environ, **(exp.get("env") or {})},
-        )
-    except subprocess.TimeoutExpired:
+        if compact:
+            result = subprocess.run(command, capture_output=True, text=True, **run_kwargs)
+            metadata["stdout"] = result.stdout or ""
+            metadata["stderr"] = result.stderr or ""
+        else:
+            stdout_path = exp_dir / "stdout.log"
+            stderr_path = exp_dir / "stderr.log"
+            with stdout_path.open("wb") as stdout_handle, stderr_path.open("wb") as stderr_handle:
+                result = subprocess.run(
+                    command, stdout=stdout_handle, stderr=stderr_handle, **run_kwargs
+                )
+    except subprocess.TimeoutExpired as exc:
         metadata["status"] = "timeout"
         metadata["exit_code"] = None
         metadata["finished_at"] = now_iso()
-        (exp_dir / "metadata.json").write_text(
-            json.dumps(metadata, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-        )
+        if compact:
+            metadata["stdout"] = decode_output(exc.stdout)
+            metadata["stderr"] = decode_output(exc.stderr)
+        else:
+            json_utils.write_json(exp_dir / "metadata.json", metadata)
         return False, metadata
 
-    (exp_dir / "stdout.log").write_text(result.stdout or "", encoding="utf-8")
-    (exp_dir / "stderr.log").write_text(result.stderr or "", encoding="utf-8")
     metadata["exit_code"] = result.returncode
     metadata["status"] = "ok" if result.returncode == 0 else "error"
     metadata["finished_at"] = now_iso()
-    (exp_dir / "metadata.json").write_text(
-        json.dumps(metadata, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-    )
+    if not compact:
+        json_utils.write_json(exp_dir / "metadata.json", metadata)
     return result.returncode == 0, metadata
 
 
@@ -169,45 +240,58 @@ def main() -> int:
     else:
         manifest_path = problem_dir / "compute" / "manifest.json"
 
-    experiments, err = load_manifest(manifest_path)
+    experiments, err = load_manifest(manifest_path, args.only)
     if err:
         print(f"ERROR: {err}")
         return 1
 
-    if args.only:
-        experiments = [
-            exp for exp in experiments if exp.get("name") == args.only
-        ]
-
     if not experiments:
         print("No experiments to run.")
         return 0
 
-    run_id = args.run_id or dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_id = args.run_id or time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
     output_dir = problem_dir / "compute" / "results" / run_id
     output_dir.mkdir(parents=True, exist_ok=True)
-    (output_dir / "manifest.json").write_text(
-        json.dumps({"experiments": experiments}, indent=2, sort_keys=False) + "\n",
-        encoding="utf-8",
-    )
-
-    failures = 0
+    json_utils.write_json(output_dir / "manifest.json", {"experiments": experiments})
+
+    generated_at = now_iso()
+    with contextlib.ExitStack() as stack:
+        results_handle = None
+        if args.compact:
+            # Append each result as its experiment finishes, so an interrupted
+            # run still leaves the completed ones in results.jsonl.
+            results_handle = stack.enter_context((output_dir / "results.jsonl").open("wb"))
+        pool = stack.enter_context(
+            concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs)
+        )
+        futures = [
+            pool.submit(
+                run_experiment,
+                root=root,
+                exp=exp,
+                output_dir=output_dir,
+                dry_run=args.dry_run,
+                compact=args.compact,
+            )
+            for exp in experiments
+        ]
+        if results_handle is not None:
+            for future in concurrent.futures.as_completed(futures):
+                _, metadata = future.result()
+                results_handle.write(json_utils.dumps_json(metadata, indent=False))
+                results_handle.flush()
+    outcomes = [future.result() for future in futures]
+    results = [metadata for _, metadata in outcomes]
+    failures = sum(1 for ok, _ in outcomes if not ok)
     summary_lines = [
         "# Experiment Summary",
         "",
         f"- problem_id: {problem_id}",
         f"- run_id: {run_id}",
-        f"- generated_at: {now_iso()}",
+        f"- generated_at: {generated_at}",
         "",
+        *(f"- {metadata['name']}: {metadata['status']}" for metadata in results),
     ]
-    for exp in experiments:
-        ok, metadata = run_experiment(
-            root=root, exp=exp, output_dir=output_dir, dry_run=args.dry_run
-        )
-        status = metadata.get("status")
-        summary_lines.append(f"- {metadata.get('name')}: {status}")
-        if not ok:
-            failures += 1
 
     (output_dir / "summary.md").write_text(
         "\n".join(summary_lines).rstrip() + "\n", encoding="utf-8"
@@ -5,24 +5,63 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
-import re
+import os
+import shutil
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import json_utils
 import llm_utils
 import solver_scaffold
 
 PLACEHOLDER_LEAN = "-- Paste Lean code below (no sorry/admit/axiom/unsafe)\n\nimport Mathlib\n\n"
+PLACEHOLDER_LEAN_BYTES = PLACEHOLDER_LEAN.encode("utf-8")
+ATTEMPTS_README_BYTES = (
+    b"# Lean Attempts\n\n"
+    b"Store iterative attempts as attempt_001.lean, attempt_002.lean, ...\n"
+    b"Use `tools/formalizer_loop.py --attempt latest --check` to validate.\n"
+)
 ATTEMPT_PREFIX = "attempt_"
-ATTEMPT_PATTERN = re.compile(r"attempt_(\d+)\.lean$")
+ATTEMPT_SUFFIX = ".lean"
+ATTEMPT_DIGITS = slice(len(ATTEMPT_PREFIX), -len(ATTEMPT_SUFFIX))
+ROOT = Path(__file__).resolve().parent.parent
+UTC = dt.timezone.utc
+
+
+PROMPT_TEMPLATE = (
+    "# Formalizer Prompt (manual)\n"
+    "\n"
+    "Version: v1\n"
+    "\n"
+    "Goal: produce Lean code that compiles in this repo using Mathlib.\n"
+    "Rules: do NOT use sorry/admit/axiom/unsafe. Keep everything explicit.\n"
+    "\n"
+    "problem_id: {problem_id}\n"
+    "\n"
+    "Frozen statement:\n"
+    "{statement}\n"
+    "\n"
+    "{lemmata}"
+    "Output: Lean code only (no Markdown), starting with imports, defining the "
+    "main theorem and any helper lemmas.\n"
+)
+
+
+FEEDBACK_HEADER_TEMPLATE = (
+    "# Formalizer feedback\n"
+    "\n"
+    "- command: {command}\n"
+    "- exit_code: {exit_code}\n"
+    "- timestamp: {timestamp}\n"
+    "\n"
+    "Lean output:\n"
+    "```\n"
+)
 
 
 def now_iso() -> str:
-    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds").replace(
-        "+00:00", "Z"
-    )
+    return dt.datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def parse_args() -> argparse.Namespace:
@@ -71,10 +110,14 @@ def resolve_run_dir(problem_dir: Path, run_id: str) -> Tuple[Optional[Path], Opt
 
 def load_best_plan(problem_dir: Path) -> Optional[Dict[str, Any]]:
     plan_path = problem_dir / "solver" / "best" / "plan.json"
-    if not plan_path.exists():
+    try:
+        raw = plan_path.read_bytes()
+    except OSError:
+        return None
+    if not raw.strip():
         return None
     try:
-        data = json.loads(plan_path.read_text(encoding="utf-8"))
+        data = json_utils.loads_json(raw)
     except Exception:
         return None
     return data if isinstance(data, dict) else None
@@ -83,32 +126,31 @@ def load_best_plan(problem_dir: Path) -> Optional[Dict[str, Any]]:
 def ensure_attempts_dir(lean_dir: Path) -> Path:
     attempts_dir = lean_dir / "attempts"
     attempts_dir.mkdir(parents=True, exist_ok=True)
-    readme_path = attempts_dir / "README.md"
-    if not readme_path.exists():
-        readme_path.write_text(
-            "# Lean Attempts\n\n"
-            "Store iterative attempts as attempt_001.lean, attempt_002.lean, ...\n"
-            "Use `tools/formalizer_loop.py --attempt latest --check` to validate.\n",
-            encoding="utf-8",
-        )
+    llm_utils.write_new_bytes(attempts_dir / "README.md", ATTEMPTS_README_BYTES)
     return attempts_dir
 
 
-def list_attempt_indices(attempts_dir: Path) -> List[int]:
-    indices: List[int] = []
-    for path in attempts_dir.glob(f"{ATTEMPT_PREFIX}*.lean"):
-        match = ATTEMPT_PATTERN.match(path.name)
-        if match:
-            try:
-                indices.append(int(match.group(1)))
-            except ValueError:
+def iter_attempt_indices(attempts_dir: Path) -> Iterator[int]:
+    try:
+        entries = os.scandir(attempts_dir)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith(ATTEMPT_PREFIX) and name.endswith(ATTEMPT_SUFFIX)):
                 continue
-    return sorted(indices)
+            digits = name[ATTEMPT_DIGITS]
+            if digits.isdecimal():
+                yield int(digits)
+
+
+def list_attempt_indices(attempts_dir: Path) -> List[int]:
+    return sorted(iter_attempt_indices(attempts_dir))
 
 
 def next_attempt_index(attempts_dir: Path) -> int:
-    indices = list_attempt_indices(attempts_dir)
-    return (indices[-1] + 1) if indices else 1
+    return max(iter_attempt_indices(attempts_dir), default=0) + 1
 
 
 def is_placeholder(text: str) -> bool:
@@ -122,10 +164,10 @@ def create_attempt(
     base_text: Optional[str] = None,
 ) -> Path:
     path = attempts_dir / f"{ATTEMPT_PREFIX}{index:03d}.lean"
-    if path.exists():
-        return path
-    content = base_text if base_text and not is_placeholder(base_text) else PLACEHOLDER_LEAN
-    path.write_text(content, encoding="utf-8")
+    if base_text and not is_placeholder(base_text):
+        llm_utils.write_new(path, base_text)
+    else:
+        llm_utils.write_new_bytes(path, PLACEHOLDER_LEAN_BYTES)
     return path
 
 
@@ -135,37 +177,24 @@ def build_prompt(
     statement_text: str,
     best_plan: Optional[Dict[str, Any]],
 ) -> str:
-    lines = [
-        "# Formalizer Prompt (manual)",
-        "",
-        "Version: v1",
-        "",
-        "Goal: produce Lean code that compiles in this repo using Mathlib.",
-        "Rules: do NOT use sorry/admit/axiom/unsafe. Keep everything explicit.",
-        "",
-        f"problem_id: {problem_id}",
-        "",
-        "Frozen statement:",
-        statement_text.strip(),
-        "",
-    ]
+    lemmata = ""
     if best_plan:
-        lines.append("Suggested lemmata (from solver/best):")
         key_lemmas = best_plan.get("key_lemmas", [])
         if isinstance(key_lemmas, list) and key_lemmas:
-            for lemma in key_lemmas:
-                if isinstance(lemma, dict):
-                    statement = str(lemma.get("statement", "")).strip()
-                    if statement:
-                        lines.append(f"- {statement}")
+            statements = (
+                str(lemma.get("statement", "")).strip()
+                for lemma in key_lemmas
+                if isinstance(lemma, dict)
+            )
+            lemma_lines = "".join(f"- {statement}\n" for statement in statements if statement)
         else:
-            lines.append("- (none listed)")
-        lines.append("")
-    lines.append(
-        "Output: Lean code only (no Markdown), starting with imports, defining the "
-        "main theorem and any helper lemmas."
+            lemma_lines = "- (none listed)\n"
+        lemmata = f"Suggested lemmata (from solver/best):\n{lemma_lines}\n"
+    return PROMPT_TEMPLATE.format(
+        problem_id=problem_id,
+        statement=statement_text.strip(),
+        lemmata=lemmata,
     )
-    return "\n".join(lines).rstrip() + "\n"
 
 
 def write_scaffold(
@@ -173,26 +202,22 @@ def write_scaffold(
     problem_dir: Path,
     problem_id: str,
     run_dir: Path,
-) -> Path:
+) -> Tuple[Path, Path]:
     lean_dir = run_dir / "lean"
-    lean_dir.mkdir(parents=True, exist_ok=True)
-    ensure_attempts_dir(lean_dir)
+    attempts_dir = ensure_attempts_dir(lean_dir)
 
     frozen_path = problem_dir / "statement" / "frozen_v1.md"
-    frozen_text = frozen_path.read_text(encoding="utf-8") if frozen_path.exists() else ""
-    statement_text = solver_scaffold.extract_statement(frozen_text)
+    statement_text = solver_scaffold.load_statement(frozen_path)
     best_plan = load_best_plan(problem_dir)
 
     prompt = build_prompt(
         problem_id=problem_id, statement_text=statement_text, best_plan=best_plan
     )
     prompt_path = lean_dir / "formalizer_prompt.md"
-    if not prompt_path.exists():
-        prompt_path.write_text(prompt, encoding="utf-8")
+    llm_utils.write_new(prompt_path, prompt)
 
     response_path = lean_dir / "formalizer_response.lean"
-    if not response_path.exists():
-        response_path.write_text(PLACEHOLDER_LEAN, encoding="utf-8")
+    llm_utils.write_new_bytes(response_path, PLACEHOLDER_LEAN_BYTES)
 
     llm_utils.write_model_prompts(
         run_dir / "llm" / "formalizer",
@@ -201,7 +226,7 @@ def write_scaffold(
         placeholder=PLACEHOLDER_LEAN,
     )
 
-    return response_path
+    return response_path, attempts_dir
 
 
 def run_check(root: Path, target: Path, run_dir: Path) -> int:
@@ -210,13 +235,6 @@ def run_check(root: Path, target: Path, run_dir: Path) -> int:
         return 1
 
     cmd = ["lake", "env", "lean", str(target)]
-    result = subprocess.run(
-        cmd,
-        cwd=root,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
     lean_dir = run_dir / "lean"
     attempts_dir = lean_dir / "attempts"
     log_path = lean_dir / "formalizer_last_build.log"
@@ -228,33 +246,30 @@ def run_check(root: Path, target: Path, run_dir: Path) -> int:
         feedback_path = attempts_dir / f"{stem}_feedback.md"
     except ValueError:
         pass
-    log_path.write_text(
-        (result.stdout or "") + "\n" + (result.stderr or ""),
-        encoding="utf-8",
-    )
+    with log_path.open("wb") as log_handle:
+        result = subprocess.run(
+            cmd,
+            cwd=root,
+            stdout=log_handle,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
 
-    feedback_lines = [
-        "# Formalizer feedback",
-        "",
-        f"- command: {' '.join(cmd)}",
-        f"- exit_code: {result.returncode}",
-        f"- timestamp: {now_iso()}",
-        "",
-        "Lean output:",
-        "```",
-        (result.stdout or "") + (result.stderr or ""),
-        "```",
-    ]
-    feedback_path.write_text(
-        "\n".join(feedback_lines).rstrip() + "\n",
-        encoding="utf-8",
+    header = FEEDBACK_HEADER_TEMPLATE.format(
+        command=" ".join(cmd),
+        exit_code=result.returncode,
+        timestamp=now_iso(),
     )
+    with feedback_path.open("wb") as handle, log_path.open("rb") as log_handle:
+        handle.write(header.encode("utf-8"))
+        shutil.copyfileobj(log_handle, handle)
+        handle.write(b"\n```\n")
     return 0 if result.returncode == 0 else 1
 
 
 def main() -> int:
     args = parse_args()
-    root = Path(__file__).resolve().parent.parent
+    root = ROOT
     try:
         problem_id, _ = solver_scaffold.normalize_problem_id(args.problem)
     except ValueError as exc:
@@ -271,7 +286,7 @@ def main() -> int:
         print(f"ERROR: {err}")
         return 1
 
-    response_path = write_scaffold(
+    response_path, attempts_dir = write_scaffold(
         problem_dir=problem_dir,
         problem_id=problem_id,
         run_dir=run_dir,
@@ -279,8 +294,6 @@ def main() -> int:
     solver_scaffold.log_event(root, f"formalizer scaffold for {problem_id} in {run_dir.name}")
 
     target: Optional[Path] = None
-    lean_dir = run_dir / "lean"
-    attempts_dir = ensure_attempts_dir(lean_dir)
     if args.new_attempt:
         base_text = None
         if response_path.exists():
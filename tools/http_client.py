@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Shared keep-alive HTTP GET client for the fetching tools."""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import http.client
+import threading
+import weakref
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+MAX_REDIRECTS = 5
+READ_CHUNK_SIZE = 64 * 1024
+# One keep-alive connection per (scheme, host) per thread, so repeated
+# requests to a host skip the TCP/TLS handshake.
+HTTP_LOCAL = threading.local()
+# Every pooled connection, across threads, so they can be closed at exit.
+OPEN_CONNECTIONS: weakref.WeakSet[http.client.HTTPConnection] = weakref.WeakSet()
+OPEN_CONNECTIONS_LOCK = threading.Lock()
+
+
+def uses_proxy(url: str) -> bool:
+    # Deferred: urllib.request is only needed once a request is actually made.
+    from urllib.request import getproxies, proxy_bypass
+
+    parts = urlsplit(url)
+    proxies = getproxies()
+    if parts.scheme not in proxies:
+        return False
+    return not proxy_bypass(parts.hostname or "")
+
+
+def get_connection(
+    scheme: str, host: str, port: Optional[int], timeout: float
+) -> http.client.HTTPConnection:
+    connections = HTTP_LOCAL.__dict__.setdefault("connections", {})
+    conn = connections.get((scheme, host, port))
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        connections[(scheme, host, port)] = conn
+        with OPEN_CONNECTIONS_LOCK:
+            OPEN_CONNECTIONS.add(conn)
+    else:
+        # A reused connection keeps the timeout it was created with; apply
+        # this caller's timeout to it and to its socket, if connected.
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def close_connections() -> None:
+    with OPEN_CONNECTIONS_LOCK:
+        connections = list(OPEN_CONNECTIONS)
+        OPEN_CONNECTIONS.clear()
+    for conn in connections:
+        conn.close()
+
+
+atexit.register(close_connections)
+
+
+def read_body(response: Any, digest: Optional[Any] = None) -> bytes:
+    decoder = None
+    if (response.headers.get("Content-Encoding") or "").lower() == "gzip":
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = []
+    while True:
+        chunk = response.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if decoder is not None:
+            chunk = decoder.decompress(chunk)
+        if digest is not None:
+            digest.update(chunk)
+        chunks.append(chunk)
+    if decoder is not None:
+        tail = decoder.flush()
+        if digest is not None:
+            digest.update(tail)
+        chunks.append(tail)
+    return b"".join(chunks)
+
+
+def request_once(
+    url: str, headers: Dict[str, str], timeout: float, with_hash: bool
+) -> Tuple[Any, bytes, Optional[str]]:
+    parts = urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    # hostname/port rather than netloc, so user:pass@ never reaches the socket.
+    key = (parts.scheme, parts.hostname or "", parts.port)
+    connections = HTTP_LOCAL.__dict__.setdefault("connections", {})
+    reused = key in connections
+    conn = get_connection(*key, timeout)
+    digest = None
+    try:
+        conn.request("GET", target, headers=headers)
+        response = conn.getresponse()
+        if with_hash and 200 <= response.status < 300:
+            digest = hashlib.sha256()
+        data = read_body(response, digest)
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        connections.pop(key, None)
+        if not reused:
+            raise
+        # The server may have closed an idle keep-alive socket; reconnect once.
+        return request_once(url, headers, timeout, with_hash)
+    return response, data, digest.hexdigest() if digest is not None else None
+
+
+def fetch(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10,
+    with_hash: bool = False,
+    max_redirects: int = MAX_REDIRECTS,
+) -> Tuple[bytes, Optional[str]]:
+    headers = dict(headers or {})
+    if urlsplit(url).scheme not in {"http", "https"} or uses_proxy(url):
+        # Non-HTTP URLs and proxied hosts go through urllib, which handles
+        # file:// and the HTTP(S)_PROXY / NO_PROXY settings.
+        from urllib.request import Request, urlopen
+
+        digest = hashlib.sha256() if with_hash else None
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+            data = read_body(response, digest)
+        return data, digest.hexdigest() if digest is not None else None
+    response, data, sha256 = request_once(url, headers, timeout, with_hash)
+    location = response.headers.get("Location")
+    if 300 <= response.status < 400 and location:
+        if max_redirects <= 0:
+            raise HTTPError(url, response.status, "too many redirects", response.headers, None)
+        # Go through fetch() again so the target gets the proxy check too.
+        return fetch(
+            urljoin(url, location),
+            headers=headers,
+            timeout=timeout,
+            with_hash=with_hash,
+            max_redirects=max_redirects - 1,
+        )
+    if response.status >= 400:
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
+    return data, sha256
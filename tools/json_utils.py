@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Shared JSON helpers: orjson when installed, stdlib json otherwise."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+def has_nonfinite(payload: Any) -> bool:
+    # orjson writes NaN/Infinity as null; stdlib json keeps them.
+    stack = [payload]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # stdlib json accepts NaN/Infinity and gives the familiar errors
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def dumps_json(payload: Any, *, indent: bool = True) -> bytes:
+    if orjson is not None and not has_nonfinite(payload):
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(payload, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits; stdlib json handles them
+    # ensure_ascii=False writes UTF-8 text the way orjson does.
+    if indent:
+        text = json.dumps(payload, indent=2, sort_keys=False, ensure_ascii=False)
+    else:
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
+
+
+def write_json(path: Path, payload: Any, *, indent: bool = True) -> None:
+    path.write_bytes(dumps_json(payload, indent=indent))
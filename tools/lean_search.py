@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
@@ -12,16 +13,46 @@ from typing import Optional, Tuple
 import llm_utils
 import solver_scaffold
 
+ROOT = Path(__file__).resolve().parent.parent
+UTC = dt.timezone.utc
 PLACEHOLDER_QUERY = (
     "-- Paste Lean search commands below (e.g. #find, #check, simp?, by?)\n\n"
     "import Mathlib\n\n"
 )
+PLACEHOLDER_QUERY_BYTES = PLACEHOLDER_QUERY.encode("utf-8")
+
+
+PROMPT_TEMPLATE = (
+    "# Lean Search Prompt (manual)\n"
+    "\n"
+    "Version: v1\n"
+    "\n"
+    "Goal: find useful lemmas in Mathlib with #find, #check, simp?, by?.\n"
+    "Rules: only output Lean commands; no proofs required.\n"
+    "\n"
+    "problem_id: {problem_id}\n"
+    "\n"
+    "Frozen statement:\n"
+    "{statement}\n"
+    "\n"
+    "Output: Lean commands only (no Markdown).\n"
+)
+
+
+FEEDBACK_HEADER_TEMPLATE = (
+    "# Lean search feedback\n"
+    "\n"
+    "- command: {command}\n"
+    "- exit_code: {exit_code}\n"
+    "- timestamp: {timestamp}\n"
+    "\n"
+    "Lean output:\n"
+    "```\n"
+)
 
 
 def now_iso() -> str:
-    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds").replace(
-        "+00:00", "Z"
-    )
+    return dt.datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def parse_args() -> argparse.Namespace:
@@ -60,22 +91,7 @@ def resolve_run_dir(problem_dir: Path, run_id: str) -> Tuple[Optional[Path], Opt
 
 
 def build_prompt(problem_id: str, statement_text: str) -> str:
-    lines = [
-        "# Lean Search Prompt (manual)",
-        "",
-        "Version: v1",
-        "",
-        "Goal: find useful lemmas in Mathlib with #find, #check, simp?, by?.",
-        "Rules: only output Lean commands; no proofs required.",
-        "",
-        f"problem_id: {problem_id}",
-        "",
-        "Frozen statement:",
-        statement_text.strip(),
-        "",
-        "Output: Lean commands only (no Markdown).",
-    ]
-    return "\n".join(lines).rstrip() + "\n"
+    return PROMPT_TEMPLATE.format(problem_id=problem_id, statement=statement_text.strip())
 
 
 def write_scaffold(
@@ -89,21 +105,17 @@ def write_scaffold(
     search_dir.mkdir(parents=True, exist_ok=True)
 
     frozen_path = problem_dir / "statement" / "frozen_v1.md"
-    frozen_text = frozen_path.read_text(encoding="utf-8") if frozen_path.exists() else ""
-    statement_text = solver_scaffold.extract_statement(frozen_text)
+    statement_text = solver_scaffold.load_statement(frozen_path)
 
     prompt = build_prompt(problem_id, statement_text)
     prompt_path = search_dir / "search_prompt.md"
-    if not prompt_path.exists():
-        prompt_path.write_text(prompt, encoding="utf-8")
+    llm_utils.write_new(prompt_path, prompt)
 
     query_path = search_dir / "search_queries.lean"
-    if not query_path.exists():
-        query_path.write_text(PLACEHOLDER_QUERY, encoding="utf-8")
+    llm_utils.write_new_bytes(query_path, PLACEHOLDER_QUERY_BYTES)
 
     notes_path = search_dir / "search_notes.md"
-    if not notes_path.exists():
-        notes_path.write_text("# Search notes\n\n", encoding="utf-8")
+    llm_utils.write_new_bytes(notes_path, b"# Search notes\n\n")
 
     llm_utils.write_model_prompts(
         run_dir / "llm" / "lean_search",
@@ -121,42 +133,32 @@ def run_check(root: Path, target: Path, search_dir: Path) -> int:
         return 1
 
     cmd = ["lake", "env", "lean", str(target)]
-    result = subprocess.run(
-        cmd,
-        cwd=root,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-
     log_path = search_dir / "search_last_run.log"
-    log_path.write_text(
-        (result.stdout or "") + "\n" + (result.stderr or ""),
-        encoding="utf-8",
-    )
-
-    feedback_lines = [
-        "# Lean search feedback",
-        "",
-        f"- command: {' '.join(cmd)}",
-        f"- exit_code: {result.returncode}",
-        f"- timestamp: {now_iso()}",
-        "",
-        "Lean output:",
-        "```",
-        (result.stdout or "") + (result.stderr or ""),
-        "```",
-    ]
-    (search_dir / "search_feedback.md").write_text(
-        "\n".join(feedback_lines).rstrip() + "\n",
-        encoding="utf-8",
+    with log_path.open("wb") as log_handle:
+        result = subprocess.run(
+            cmd,
+            cwd=root,
+            stdout=log_handle,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+
+    header = FEEDBACK_HEADER_TEMPLATE.format(
+        command=" ".join(cmd),
+        exit_code=result.returncode,
+        timestamp=now_iso(),
     )
+    feedback_path = search_dir / "search_feedback.md"
+    with feedback_path.open("wb") as handle, log_path.open("rb") as log_handle:
+        handle.write(header.encode("utf-8"))
+        shutil.copyfileobj(log_handle, handle)
+        handle.write(b"\n```\n")
     return 0 if result.returncode == 0 else 1
 
 
 def main() -> int:
     args = parse_args()
-    root = Path(__file__).resolve().parent.parent
+    root = ROOT
     try:
         problem_id, _ = solver_scaffold.normalize_problem_id(args.problem)
     except ValueError as exc:
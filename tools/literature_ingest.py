@@ -6,21 +6,29 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import hashlib
-import json
+import heapq
+import itertools
 import re
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import json_utils
 import literature_scout
 
 ALLOWED_ID_TYPES = {"doi", "arxiv", "zbmath", "openalex"}
+RESPONSE_FILENAME = "chatgpt_response.md"
+PROMPT_FILENAME = "chatgpt_prompt.md"
+MANUAL_PROVIDER = "chatgpt_pro_manual"
+PROBLEM_ID_PATTERN = re.compile(r"[Pp]?(\d+)")
+JSON_FENCE_PATTERN = re.compile(rb"```json(.*?)```", re.S | re.I)
+FENCE_PATTERN = re.compile(rb"```(.*?)```", re.S)
+DIGIT_PATTERN = re.compile(r"\d")
+HASH_CHUNK_SIZE = 64 * 1024
 
 
 def now_iso() -> str:
-    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds").replace(
-        "+00:00", "Z"
-    )
+    return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def parse_args() -> argparse.Namespace:
@@ -40,7 +48,7 @@ def parse_args() -> argparse.Namespace:
 
 
 def normalize_problem_id(raw: str) -> str:
-    match = re.fullmatch(r"[Pp]?(\d+)", raw.strip())
+    match = PROBLEM_ID_PATTERN.fullmatch(raw.strip())
     if not match:
         raise ValueError(f"Invalid problem id: {raw!r}")
     number_str = match.group(1)
@@ -49,16 +57,16 @@ def normalize_problem_id(raw: str) -> str:
     return f"P{number:0{width}d}"
 
 
-def extract_json(text: str) -> Optional[Dict[str, Any]]:
-    match = re.search(r"```json(.*?)```", text, re.S | re.I)
+def extract_json(data: bytes) -> Optional[Dict[str, Any]]:
+    match = JSON_FENCE_PATTERN.search(data)
     if not match:
-        match = re.search(r"```(.*?)```", text, re.S)
+        match = FENCE_PATTERN.search(data)
     if match:
         blob = match.group(1)
     else:
-        blob = text
+        blob = data
     try:
-        data = json.loads(blob)
+        data = json_utils.loads_json(blob)
     except Exception:
         return None
     if isinstance(data, dict):
@@ -73,7 +81,7 @@ def normalize_id(id_type: str, value: str) -> Optional[str]:
     if id_type == "doi":
         return literature_scout.doi_to_id(value)
     if id_type == "arxiv":
-        if re.search(r"\d", value):
+        if DIGIT_PATTERN.search(value):
             return value
         return None
     if id_type == "zbmath":
@@ -102,7 +110,7 @@ def normalize_url(id_type: str, value: str, url: Optional[str]) -> Optional[str]
 def normalize_candidate(
     raw: Dict[str, Any],
     errors: List[str],
-    source: str,
+    provenance: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:
     id_type = raw.get("id_type")
     if not isinstance(id_type, str) or id_type not in ALLOWED_ID_TYPES:
@@ -128,44 +136,43 @@ def normalize_candidate(
     if not isinstance(confidence, (int, float)):
         errors.append(f"candidate {normalized_id} missing confidence")
         return None
+    ascii_safe = literature_scout.ascii_safe
     authors_raw = raw.get("authors") if isinstance(raw.get("authors"), list) else []
     authors = [
-        literature_scout.ascii_safe(str(author))
+        ascii_safe(str(author))
         for author in authors_raw
         if isinstance(author, str)
     ]
     year = raw.get("year")
     year_str = str(year) if isinstance(year, (int, str)) else None
     url = normalize_url(id_type, normalized_id, raw.get("url"))
-    reasons_safe = [literature_scout.ascii_safe(str(reason)) for reason in reasons]
+    reasons_safe = [ascii_safe(str(reason)) for reason in reasons]
     candidate = {
         "id": normalized_id,
         "id_type": id_type,
-        "title": literature_scout.ascii_safe(title),
+        "title": ascii_safe(title),
         "authors": authors,
         "year": year_str,
         "url": url,
         "confidence": float(confidence),
         "reasons": reasons_safe,
         "status": "NEEDS_REVIEW",
-        "provenance": [
-            {
-                "provider": source,
-                "query": "manual",
-                "source_url": f"manual:{source}",
-                "fetched_at": now_iso(),
-                "cache_hit": False,
-            }
-        ],
+        "provenance": [provenance.copy()],
     }
     return candidate
 
 
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def load_json(path: Path) -> Optional[Dict[str, Any]]:
-    if not path.exists():
-        return None
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json_utils.loads_json(path.read_bytes())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
@@ -184,14 +191,15 @@ def main() -> int:
     response_path = (
         Path(args.response)
         if args.response
-        else (literature_dir / "chatgpt_response.md")
+        else (literature_dir / RESPONSE_FILENAME)
     )
-    if not response_path.exists():
+    try:
+        response_bytes = response_path.read_bytes()
+    except FileNotFoundError:
         print(f"ERROR: response file not found: {response_path}")
         return 1
 
-    response_text = response_path.read_text(encoding="utf-8")
-    payload = extract_json(response_text)
+    payload = extract_json(response_bytes)
     if payload is None:
         print("ERROR: could not parse JSON from response.")
         return 1
@@ -203,70 +211,80 @@ def main() -> int:
 
     source = args.source
     if not source:
-        if response_path.name == "chatgpt_response.md":
-            source = "chatgpt_pro_manual"
+        if response_path.name == RESPONSE_FILENAME:
+            source = MANUAL_PROVIDER
         else:
             source = "manual_llm"
 
+    generated_at = now_iso()
+    provenance = {
+        "provider": source,
+        "query": "manual",
+        "source_url": f"manual:{source}",
+        "fetched_at": generated_at,
+        "cache_hit": False,
+    }
     errors: List[str] = []
     manual_candidates: List[Dict[str, Any]] = []
     for raw in manual_candidates_raw:
         if not isinstance(raw, dict):
             errors.append("candidate entry is not an object")
             continue
-        candidate = normalize_candidate(raw, errors, source)
+        candidate = normalize_candidate(raw, errors, provenance)
         if candidate:
             manual_candidates.append(candidate)
 
-    response_sha = hashlib.sha256(response_text.encode("utf-8")).hexdigest()
-    prompt_path = literature_dir / "chatgpt_prompt.md"
-    prompt_sha = None
-    if prompt_path.exists():
-        prompt_sha = hashlib.sha256(
-            prompt_path.read_text(encoding="utf-8").encode("utf-8")
-        ).hexdigest()
+    response_sha = hashlib.sha256(response_bytes).hexdigest()
+    prompt_path = literature_dir / PROMPT_FILENAME
+    try:
+        prompt_sha: Optional[str] = sha256_file(prompt_path)
+    except FileNotFoundError:
+        prompt_sha = None
 
     candidates_path = literature_dir / "candidates.json"
     queries_path = literature_dir / "queries.json"
     existing = load_json(candidates_path) or {}
     existing_candidates = existing.get("candidates") if isinstance(existing.get("candidates"), list) else []
-    existing_queries = []
+    merged_queries: List[Dict[str, Any]] = []
     queries_payload = load_json(queries_path)
     if isinstance(queries_payload, dict) and isinstance(queries_payload.get("queries"), list):
-        existing_queries = queries_payload["queries"]
+        merged_queries = queries_payload["queries"]
     existing_errors = existing.get("errors") if isinstance(existing.get("errors"), list) else []
 
     manual_query = {
-        "provider": "chatgpt_pro_manual",
+        "provider": MANUAL_PROVIDER,
         "query": "manual",
         "url": None,
         "cache_hit": False,
         "status": "ok",
         "error": None,
-        "timestamp": now_iso(),
+        "timestamp": generated_at,
         "prompt_sha256": prompt_sha,
         "response_sha256": response_sha,
     }
     manual_query_notes = payload.get("queries")
     if isinstance(manual_query_notes, list):
         manual_query["queries"] = manual_query_notes
-    merged_queries = existing_queries + [manual_query]
+    merged_queries.append(manual_query)
 
     merged_candidates = literature_scout.dedupe_candidates(
-        existing_candidates + manual_candidates
+        itertools.chain(existing_candidates, manual_candidates)
     )
-    merged_candidates.sort(
-        key=lambda cand: (-cand.get("confidence", 0.0), cand.get("year") or "")
+    merged_candidates = heapq.nsmallest(
+        literature_scout.DEFAULT_MAX_CANDIDATES,
+        merged_candidates,
+        key=lambda cand: (-cand.get("confidence", 0.0), cand.get("year") or ""),
     )
-    merged_candidates = merged_candidates[: literature_scout.DEFAULT_MAX_CANDIDATES]
 
-    combined_errors = existing_errors + payload.get("errors", []) if isinstance(payload.get("errors"), list) else existing_errors
+    combined_errors = list(existing_errors)
+    payload_errors = payload.get("errors")
+    if isinstance(payload_errors, list):
+        combined_errors.extend(payload_errors)
     combined_errors.extend(errors)
     solver_used = bool(existing.get("solver_used_scout"))
     if isinstance(payload.get("solver_used_scout"), bool):
         solver_used = solver_used or payload["solver_used_scout"]
 
-    generated_at = now_iso()
     literature_scout.write_candidates_json(
         candidates_path,
         problem_id,
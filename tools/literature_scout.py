@@ -3,22 +3,36 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
 import datetime as dt
+import functools
 import hashlib
 import json
 import os
 import re
+import tempfile
+import threading
 import unicodedata
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote_plus
-from urllib.request import Request, urlopen
 
+import json_utils
 import llm_utils
+
 DEFAULT_MAX_RESULTS = int(os.getenv("LITERATURE_SCOUT_MAX_RESULTS", "5"))
 DEFAULT_MAX_CANDIDATES = int(os.getenv("LITERATURE_SCOUT_MAX_CANDIDATES", "20"))
 DEFAULT_CACHE_TTL_DAYS = int(os.getenv("LITERATURE_SCOUT_CACHE_TTL_DAYS", "14"))
+MAX_WORKERS = 8
+# Entries older than the TTL are still served, flagged as cache_stale (and
+# refreshed in the background when online), until they reach
+# STALE_TTL_FACTOR times the TTL.
+STALE_TTL_FACTOR = 3
+# Created on first use so importing this module never starts threads.
+REFRESH_POOL: Optional[concurrent.futures.ThreadPoolExecutor] = None
+REFRESH_POOL_LOCK = threading.Lock()
 
 STOPWORDS = {
     "a",
@@ -51,6 +65,21 @@ STOPWORDS = {
     "true",
 }
 
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Inline math ($...$) and LaTeX commands (\foo) carry no search keywords;
+# they match without a group, so findall yields "" for them.
+KEYWORD_PATTERN = re.compile(r"\$[^$]*\$|\\[a-z]+|([a-z0-9]+)")
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+ARXIV_ABS_PATTERN = re.compile(r"arxiv.org/abs/(.+)")
+DIGIT_PATTERN = re.compile(r"\d")
+# Atom tags in Clark notation, so lookups skip namespace-prefix expansion.
+ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+ATOM_ID = "{http://www.w3.org/2005/Atom}id"
+ATOM_TITLE = "{http://www.w3.org/2005/Atom}title"
+ATOM_AUTHOR = "{http://www.w3.org/2005/Atom}author"
+ATOM_NAME = "{http://www.w3.org/2005/Atom}name"
+ATOM_PUBLISHED = "{http://www.w3.org/2005/Atom}published"
+
 CHATGPT_PROMPT_VERSION = "v1"
 LLM_PLACEHOLDER = "# Paste model output below\n\n"
 
@@ -62,12 +91,14 @@ def now_iso() -> str:
 
 
 def ascii_safe(text: str) -> str:
+    if text.isascii():
+        return text
     normalized = unicodedata.normalize("NFKD", text)
     return normalized.encode("ascii", "ignore").decode("ascii")
 
 
 def normalize_title(text: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", text.lower())
+    return NON_ALNUM_PATTERN.sub("", text.lower())
 
 
 def detect_offline(explicit_offline: bool) -> bool:
@@ -84,20 +115,17 @@ def detect_offline(explicit_offline: bool) -> bool:
 
 
 def tokenise(text: str) -> List[str]:
-    tokens = re.findall(r"[A-Za-z0-9]+", text.lower())
-    return [token for token in tokens if token and token not in STOPWORDS]
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
 
 
 def extract_keywords(text: Optional[str], limit: int = 8) -> List[str]:
     if not text:
         return []
-    cleaned = re.sub(r"\$[^$]*\$", " ", text)
-    cleaned = re.sub(r"\\[A-Za-z]+", " ", cleaned)
-    counts: Dict[str, int] = {}
-    for token in tokenise(cleaned):
-        if len(token) < 4:
-            continue
-        counts[token] = counts.get(token, 0) + 1
+    counts = collections.Counter(
+        token
+        for token in KEYWORD_PATTERN.findall(text.lower())
+        if len(token) >= 4 and token not in STOPWORDS
+    )
     ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
     return [token for token, _ in ranked[:limit]]
 
@@ -128,13 +156,13 @@ def cache_path(cache_dir: Path, provider: str, query: str) -> Path:
     return cache_dir / provider / f"{digest}.json"
 
 
-def load_cache(path: Path, ttl_days: int) -> Optional[Dict[str, Any]]:
-    if not path.exists():
-        return None
+def load_cache(path: Path, ttl_days: int) -> Optional[Tuple[Dict[str, Any], bool]]:
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json_utils.loads_json(path.read_bytes())
     except Exception:
         return None
+    if not isinstance(data, dict):
+        return None
     fetched_at = data.get("fetched_at")
     if not isinstance(fetched_at, str):
         return None
@@ -142,14 +170,27 @@ def load_cache(path: Path, ttl_days: int) -> Optional[Dict[str, Any]]:
         fetched_dt = dt.datetime.fromisoformat(fetched_at.replace("Z", "+00:00"))
     except Exception:
         return None
-    if dt.datetime.now(dt.timezone.utc) - fetched_dt > dt.timedelta(days=ttl_days):
+    age = dt.datetime.now(dt.timezone.utc) - fetched_dt
+    if age > dt.timedelta(days=ttl_days * STALE_TTL_FACTOR):
         return None
-    return data
+    return data, age > dt.timedelta(days=ttl_days)
 
 
 def save_cache(path: Path, payload: Dict[str, Any]) -> None:
     ensure_dir(path.parent)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    # Cache entries are machine-read only, so skip the pretty-printing.
+    data = json_utils.dumps_json(payload, indent=False)
+    # Write to a temp file and rename, so concurrent readers (and background
+    # refreshes) never see a half-written entry.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
 
 
 def log_event(log_path: Path, message: str) -> None:
@@ -163,36 +204,29 @@ def http_get(url: str, timeout: int = 10, headers: Optional[Dict[str, str]] = No
     base_headers = {"User-Agent": "ErdosLab literature scout"}
     if headers:
         base_headers.update(headers)
-    req = Request(url, headers=base_headers)
-    with urlopen(req, timeout=timeout) as response:
-        return response.read()
+    # The HTTP client is only needed when a provider is actually queried;
+    # most tools import this module just for keyword/ascii helpers.
+    import http_client
 
+    data, _ = http_client.fetch(url, headers=base_headers, timeout=timeout)
+    return data
 
-def fetch_cached(
-    provider: str,
-    query: str,
+
+def refresh_cache(
+    path: Path,
     url: str,
-    cache_dir: Path,
-    offline: bool,
-    ttl_days: int,
     expect: str,
     headers: Optional[Dict[str, str]] = None,
-) -> Tuple[Optional[Any], bool, Optional[str]]:
-    path = cache_path(cache_dir, provider, query)
-    cached = load_cache(path, ttl_days)
-    if cached is not None:
-        return cached.get("payload"), True, None
-    if offline:
-        return None, False, "offline/no cache"
+) -> Tuple[Optional[Any], Optional[str]]:
     try:
         raw = http_get(url, headers=headers)
     except Exception as exc:
-        return None, False, str(exc)
+        return None, str(exc)
     if expect == "json":
         try:
             payload = json.loads(raw.decode("utf-8", errors="replace"))
         except Exception as exc:
-            return None, False, f"json decode error: {exc}"
+            return None, f"json decode error: {exc}"
     else:
         payload = raw.decode("utf-8", errors="replace")
     save_cache(
@@ -203,7 +237,63 @@ def fetch_cached(
             "payload": payload,
         },
     )
-    return payload, False, None
+    return payload, None
+
+
+def refresh_pool() -> concurrent.futures.ThreadPoolExecutor:
+    global REFRESH_POOL
+    with REFRESH_POOL_LOCK:
+        if REFRESH_POOL is None:
+            REFRESH_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return REFRESH_POOL
+
+
+def shutdown_refresh_pool() -> None:
+    global REFRESH_POOL
+    with REFRESH_POOL_LOCK:
+        pool, REFRESH_POOL = REFRESH_POOL, None
+    if pool is not None:
+        # Let in-flight refreshes finish their cache writes; drop queued ones,
+        # which the next run will retry, instead of holding up process exit.
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def log_refresh_failure(log_path: Path, url: str, future: concurrent.futures.Future) -> None:
+    if future.cancelled():
+        return
+    try:
+        _, error = future.result()
+    except Exception as exc:  # refresh_cache only raises on local I/O errors
+        error = str(exc)
+    if error:
+        log_event(log_path, f"background refresh of {url} failed: {error}")
+
+
+def fetch_cached(
+    provider: str,
+    query: str,
+    url: str,
+    cache_dir: Path,
+    offline: bool,
+    ttl_days: int,
+    expect: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[Optional[Any], bool, bool, Optional[str]]:
+    path = cache_path(cache_dir, provider, query)
+    cached = load_cache(path, ttl_days)
+    if cached is not None:
+        data, stale = cached
+        if stale and not offline:
+            # Serve the stale entry now and refresh it in the background.
+            future = refresh_pool().submit(refresh_cache, path, url, expect, headers)
+            future.add_done_callback(
+                functools.partial(log_refresh_failure, cache_dir / "refresh.log", url)
+            )
+        return data.get("payload"), True, stale, None
+    if offline:
+        return None, False, False, "offline/no cache"
+    payload, error = refresh_cache(path, url, expect, headers)
+    return payload, False, False, error
 
 
 def doi_to_id(doi: Optional[str]) -> Optional[str]:
@@ -279,7 +369,7 @@ def query_openalex(
         "https://api.openalex.org/works?search="
         f"{quote_plus(query)}&per_page={DEFAULT_MAX_RESULTS}"
     )
-    payload, cache_hit, error = fetch_cached(
+    payload, cache_hit, cache_stale, error = fetch_cached(
         "openalex", query, url, cache_dir, offline, ttl_days, "json"
     )
     info = {
@@ -287,6 +377,7 @@ def query_openalex(
         "query": query,
         "url": url,
         "cache_hit": cache_hit,
+        "cache_stale": cache_stale,
         "status": "ok" if error is None else "error",
         "error": error,
         "timestamp": now_iso(),
@@ -350,7 +441,7 @@ def query_crossref(
         "https://api.crossref.org/works?query="
         f"{quote_plus(query)}&rows={DEFAULT_MAX_RESULTS}"
     )
-    payload, cache_hit, error = fetch_cached(
+    payload, cache_hit, cache_stale, error = fetch_cached(
         "crossref", query, url, cache_dir, offline, ttl_days, "json"
     )
     info = {
@@ -358,6 +449,7 @@ def query_crossref(
         "query": query,
         "url": url,
         "cache_hit": cache_hit,
+        "cache_stale": cache_stale,
         "status": "ok" if error is None else "error",
         "error": error,
         "timestamp": now_iso(),
@@ -410,11 +502,11 @@ def query_crossref(
 
 
 def parse_arxiv_id(entry_id: str) -> Optional[str]:
-    match = re.search(r"arxiv.org/abs/(.+)", entry_id)
+    match = ARXIV_ABS_PATTERN.search(entry_id)
     if not match:
         return None
     arxiv_id = match.group(1).strip()
-    return arxiv_id if re.search(r"\d", arxiv_id) else None
+    return arxiv_id if DIGIT_PATTERN.search(arxiv_id) else None
 
 
 def query_arxiv(
@@ -428,7 +520,7 @@ def query_arxiv(
         "http://export.arxiv.org/api/query?search_query=all:"
         f"{quote_plus(query)}&start=0&max_results={DEFAULT_MAX_RESULTS}"
     )
-    payload, cache_hit, error = fetch_cached(
+    payload, cache_hit, cache_stale, error = fetch_cached(
         "arxiv", query, url, cache_dir, offline, ttl_days, "xml"
     )
     info = {
@@ -436,32 +528,34 @@ def query_arxiv(
         "query": query,
         "url": url,
         "cache_hit": cache_hit,
+        "cache_stale": cache_stale,
         "status": "ok" if error is None else "error",
         "error": error,
         "timestamp": now_iso(),
     }
     if error or not isinstance(payload, str):
         return [], info, error
+    import xml.etree.ElementTree as ET
+
     try:
         root = ET.fromstring(payload)
     except Exception as exc:
         return [], info, f"xml parse error: {exc}"
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
     candidates: List[Dict[str, Any]] = []
-    for entry in root.findall("atom:entry", ns):
-        entry_id = entry.findtext("atom:id", default="", namespaces=ns)
+    for entry in root.iterfind(ATOM_ENTRY):
+        entry_id = entry.findtext(ATOM_ID, default="")
         arxiv_id = parse_arxiv_id(entry_id)
         if not arxiv_id:
             continue
-        title = entry.findtext("atom:title", default="", namespaces=ns).strip()
+        title = entry.findtext(ATOM_TITLE, default="").strip()
         if not title:
             continue
         authors = []
-        for author in entry.findall("atom:author", ns):
-            name = author.findtext("atom:name", default="", namespaces=ns)
+        for author in entry.iterfind(ATOM_AUTHOR):
+            name = author.findtext(ATOM_NAME, default="")
             if name:
                 authors.append(name.strip())
-        published = entry.findtext("atom:published", default="", namespaces=ns)
+        published = entry.findtext(ATOM_PUBLISHED, default="")
         year = published[:4] if published else None
         candidates.append(
             build_candidate(
@@ -492,7 +586,7 @@ def query_zbmath(
         "https://api.zbmath.org/v1/document/_search?search_string="
         f"{quote_plus(query)}&results_per_page={DEFAULT_MAX_RESULTS}"
     )
-    payload, cache_hit, error = fetch_cached(
+    payload, cache_hit, cache_stale, error = fetch_cached(
         "zbmath", query, url, cache_dir, offline, ttl_days, "json"
     )
     info = {
@@ -500,6 +594,7 @@ def query_zbmath(
         "query": query,
         "url": url,
         "cache_hit": cache_hit,
+        "cache_stale": cache_stale,
         "status": "ok" if error is None else "error",
         "error": error,
         "timestamp": now_iso(),
@@ -559,6 +654,7 @@ def query_semantic_scholar(
             "query": query,
             "url": None,
             "cache_hit": False,
+            "cache_stale": False,
             "status": "skipped",
             "error": "missing SEMANTIC_SCHOLAR_API_KEY",
             "timestamp": now_iso(),
@@ -569,7 +665,7 @@ def query_semantic_scholar(
         f"query={quote_plus(query)}&limit={DEFAULT_MAX_RESULTS}"
         "&fields=title,authors,year,externalIds,url"
     )
-    payload, cache_hit, error = fetch_cached(
+    payload, cache_hit, cache_stale, error = fetch_cached(
         "semantic_scholar",
         query,
         url,
@@ -584,6 +680,7 @@ def query_semantic_scholar(
         "query": query,
         "url": url,
         "cache_hit": cache_hit,
+        "cache_stale": cache_stale,
         "status": "ok" if error is None else "error",
         "error": error,
         "timestamp": now_iso(),
@@ -644,17 +741,20 @@ def merge_provenance(existing: Dict[str, Any], incoming: Dict[str, Any]) -> None
 
 
 def dedupe_candidates(candidates: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    deduped: Dict[str, Dict[str, Any]] = {}
+    deduped: Dict[Tuple[str, ...], Dict[str, Any]] = {}
     for candidate in candidates:
         candidate_id = candidate.get("id")
         id_type = candidate.get("id_type")
         if candidate_id and id_type:
-            key = f"{id_type}:{str(candidate_id).lower()}"
+            key: Tuple[str, ...] = (str(id_type), str(candidate_id).lower())
         else:
-            title = candidate.get("title", "")
-            year = candidate.get("year", "")
-            author = candidate.get("authors", [""])[0] if candidate.get("authors") else ""
-            key = f"title:{normalize_title(title)}:{year}:{normalize_title(author)}"
+            authors = candidate.get("authors")
+            key = (
+                "title",
+                normalize_title(candidate.get("title", "")),
+                str(candidate.get("year", "")),
+                normalize_title(authors[0]) if authors else "",
+            )
         existing = deduped.get(key)
         if existing:
             merge_provenance(existing, candidate)
@@ -669,6 +769,7 @@ def write_candidates_md(
     generated_at: str,
     offline: bool,
     errors: List[str],
+    stale: Optional[List[str]] = None,
 ) -> None:
     lines = [
         "# Literature Candidates (UNVERIFIED)",
@@ -678,6 +779,11 @@ def write_candidates_md(
         "Status: discovery-only; NO results are verified.",
         "",
     ]
+    if stale:
+        lines.append(f"Stale cache (older than {DEFAULT_CACHE_TTL_DAYS} days):")
+        for entry in stale:
+            lines.append(f"- {ascii_safe(entry)}")
+        lines.append("")
     if not candidates:
         lines.append("No verified candidates returned.")
         if errors:
@@ -711,8 +817,7 @@ def write_candidates_md(
 
 
 def write_queries_json(path: Path, queries: List[Dict[str, Any]], generated_at: str) -> None:
-    payload = {"generated_at": generated_at, "queries": queries}
-    path.write_text(json.dumps(payload, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    json_utils.write_json(path, {"generated_at": generated_at, "queries": queries})
 
 
 def write_candidates_json(
@@ -734,7 +839,7 @@ def write_candidates_json(
         "candidates": candidates,
         "errors": errors,
     }
-    path.write_text(json.dumps(payload, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    json_utils.write_json(path, payload)
 
 
 def write_triage_md(path: Path, candidates: List[Dict[str, Any]], generated_at: str) -> None:
@@ -875,39 +980,51 @@ def run_literature_scout(
         ("arxiv", query_arxiv),
         ("zbmath", query_zbmath),
     ]
+    tasks = []
     for query in queries:
         for name, handler in providers:
-            results, info, error = handler(
-                query=query,
-                cache_dir=cache_dir,
-                offline=offline,
-                ttl_days=ttl_days,
-                keywords=keywords,
+            tasks.append((name, query, functools.partial(handler, query=query)))
+        tasks.append(
+            (
+                "semantic_scholar",
+                query,
+                functools.partial(query_semantic_scholar, query=query, api_key=api_key),
             )
+        )
+    common = {
+        "cache_dir": cache_dir,
+        "offline": offline,
+        "ttl_days": ttl_days,
+        "keywords": keywords,
+    }
+    ensure_dir(log_path.parent)
+    with contextlib.ExitStack() as stack:
+        stack.callback(shutdown_refresh_pool)
+        if offline:
+            outcomes = (call(**common) for _, _, call in tasks)
+        else:
+            # Provider lookups are network-bound and independent; overlap them.
+            pool = stack.enter_context(
+                concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            )
+            futures = [pool.submit(call, **common) for _, _, call in tasks]
+            outcomes = (future.result() for future in futures)
+        # One line-buffered handle for the run: each line is on disk before the
+        # next lookup is awaited, stamped with the time that lookup finished.
+        log_handle = stack.enter_context(
+            log_path.open("a", encoding="utf-8", errors="ignore", buffering=1)
+        )
+        for (name, query, _), (results, info, error) in zip(tasks, outcomes):
             queries_log.append(info)
-            if error:
+            if name == "semantic_scholar" and info.get("status") == "skipped":
+                message = "semantic_scholar skipped (missing API key)"
+            elif error:
                 errors.append(f"{name} query '{query}': {error}")
-                log_event(log_path, f"{name} query '{query}' failed: {error}")
+                message = f"{name} query '{query}' failed: {error}"
             else:
-                log_event(log_path, f"{name} query '{query}' ok ({len(results)} results)")
+                message = f"{name} query '{query}' ok ({len(results)} results)"
+            log_handle.write(f"[{info.get('timestamp') or now_iso()}] {message}\n")
             all_candidates.extend(results)
-        results, info, error = query_semantic_scholar(
-            query=query,
-            cache_dir=cache_dir,
-            offline=offline,
-            ttl_days=ttl_days,
-            keywords=keywords,
-            api_key=api_key,
-        )
-        queries_log.append(info)
-        if error and info.get("status") != "skipped":
-            errors.append(f"semantic_scholar query '{query}': {error}")
-            log_event(log_path, f"semantic_scholar query '{query}' failed: {error}")
-        elif info.get("status") == "skipped":
-            log_event(log_path, "semantic_scholar skipped (missing API key)")
-        else:
-            log_event(log_path, f"semantic_scholar query '{query}' ok ({len(results)} results)")
-        all_candidates.extend(results)
 
     deduped = dedupe_candidates(all_candidates)
     deduped.sort(key=lambda cand: (-cand.get("confidence", 0.0), cand.get("year") or ""))
@@ -920,6 +1037,11 @@ def run_literature_scout(
         generated_at,
         offline,
         errors,
+        stale=[
+            f"{info['provider']} query '{info['query']}'"
+            for info in queries_log
+            if info.get("cache_stale")
+        ],
     )
     write_candidates_json(
         literature_dir / "candidates.json",
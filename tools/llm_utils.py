@@ -3,12 +3,14 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 from pathlib import Path
 from typing import Iterable, List
 
 DEFAULT_LLM_MODELS = ["gpt-5.2-pro", "gemini-deepthink"]
+LABEL_PATTERN = re.compile(r"[^a-z0-9]+")
 
 
 def parse_models(env_var: str = "LLM_MODELS") -> List[str]:
@@ -17,11 +19,30 @@ def parse_models(env_var: str = "LLM_MODELS") -> List[str]:
     return models or list(DEFAULT_LLM_MODELS)
 
 
+@functools.lru_cache(maxsize=256)
 def sanitize_label(model: str) -> str:
-    label = re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")
+    label = LABEL_PATTERN.sub("_", model.lower()).strip("_")
     return label or "model"
 
 
+def write_new(path: Path, text: str) -> None:
+    # Exclusive create: one open() instead of exists() + write, no races.
+    try:
+        with path.open("x", encoding="utf-8") as handle:
+            handle.write(text)
+    except FileExistsError:
+        pass
+
+
+def write_new_bytes(path: Path, data: bytes) -> None:
+    # Same as write_new for content that is already encoded.
+    try:
+        with path.open("xb") as handle:
+            handle.write(data)
+    except FileExistsError:
+        pass
+
+
 def write_model_prompts(
     base_dir: Path,
     prompt_text: str,
@@ -35,10 +56,5 @@ def write_model_prompts(
         label = sanitize_label(model)
         prompt_path = base_dir / f"{label}_prompt.md"
         response_path = base_dir / f"{label}_response{response_extension}"
-        if not prompt_path.exists():
-            prompt_path.write_text(
-                f"# Model: {model}\n\n{prompt_text.rstrip()}\n",
-                encoding="utf-8",
-            )
-        if not response_path.exists():
-            response_path.write_text(placeholder, encoding="utf-8")
+        write_new(prompt_path, f"# Model: {model}\n\n{prompt_text.rstrip()}\n")
+        write_new(response_path, placeholder)
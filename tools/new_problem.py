@@ -3,12 +3,13 @@
 
 from __future__ import annotations
 
-import json
 import shutil
 import sys
 from pathlib import Path
 from typing import Any, Dict
 
+import json_utils
+
 
 def usage() -> None:
     print("Usage: python3 tools/new_problem.py PXXXX \"Optional title\"")
@@ -18,8 +19,7 @@ def load_status(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
+        data = json_utils.loads_json(path.read_bytes())
         if isinstance(data, dict):
             return data
     except Exception:
@@ -78,10 +78,7 @@ def main() -> int:
     if not isinstance(data.get("evidence"), list):
         data["evidence"] = []
 
-    status_path.write_text(
-        json.dumps(data, indent=2, sort_keys=False) + "\n",
-        encoding="utf-8",
-    )
+    json_utils.write_json(status_path, data)
 
     print(f"Created {target_dir.relative_to(root)}")
     print("ACTIVE was not modified.")
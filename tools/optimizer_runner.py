@@ -4,16 +4,19 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import datetime as dt
-import json
 import os
-import re
 import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import json_utils
 import solver_scaffold
 
+# Scorers print their JSON result last, so the tail of stdout is scanned first.
+STDOUT_TAIL_BYTES = 64 * 1024
+
 
 def now_iso() -> str:
     return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds").replace(
@@ -52,14 +55,23 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print commands without executing.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of seeds to run in parallel (default: 1).",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 
 def load_config(path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     if not path.exists():
         return None, f"config not found: {path}"
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json_utils.loads_json(path.read_bytes())
     except Exception as exc:
         return None, f"invalid JSON: {exc}"
     if not isinstance(payload, dict):
@@ -76,12 +88,13 @@ def resolve_command(command: Any, seed: int) -> Optional[List[str]]:
 
 
 def extract_json(text: str) -> Optional[Dict[str, Any]]:
-    match = re.search(r"\{.*\}", text, re.S)
-    if not match:
+    # Same span as a greedy DOTALL {.*} match, without the regex engine.
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
         return None
-    blob = match.group(0)
     try:
-        data = json.loads(blob)
+        data = json_utils.loads_json(text[start:end + 1])
     except Exception:
         return None
     return data if isinstance(data, dict) else None
@@ -96,6 +109,18 @@ def log_event(root: Path, message: str) -> None:
         handle.write(f"[{timestamp}] {message}\n")
 
 
+def read_result_json(path: Path) -> Optional[Dict[str, Any]]:
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(max(0, size - STDOUT_TAIL_BYTES))
+        payload = extract_json(handle.read().decode("utf-8", errors="replace"))
+        if payload is None and size > STDOUT_TAIL_BYTES:
+            # The result may be longer than the tail; fall back to the whole log.
+            handle.seek(0)
+            payload = extract_json(handle.read().decode("utf-8", errors="replace"))
+    return payload
+
+
 def run_single(
     root: Path,
     command: List[str],
@@ -116,23 +141,22 @@ def run_single(
     if dry_run:
         metadata["status"] = "dry-run"
         metadata["finished_at"] = now_iso()
-        (seed_dir / "metadata.json").write_text(
-            json.dumps(metadata, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-        )
+        json_utils.write_json(seed_dir / "metadata.json", metadata)
         return metadata
 
-    result = subprocess.run(
-        command,
-        cwd=root,
-        capture_output=True,
-        text=True,
-        check=False,
-        env={**os.environ, **env, "RUN_SEED": str(seed)},
-    )
-    (seed_dir / "stdout.log").write_text(result.stdout or "", encoding="utf-8")
-    (seed_dir / "stderr.log").write_text(result.stderr or "", encoding="utf-8")
+    stdout_path = seed_dir / "stdout.log"
+    stderr_path = seed_dir / "stderr.log"
+    with stdout_path.open("wb") as out_handle, stderr_path.open("wb") as err_handle:
+        result = subprocess.run(
+            command,
+            cwd=root,
+            stdout=out_handle,
+            stderr=err_handle,
+            check=False,
+            env={**os.environ, **env, "RUN_SEED": str(seed)},
+        )
 
-    payload = extract_json(result.stdout or "")
+    payload = read_result_json(stdout_path)
     score = None
     valid = False
     if payload and isinstance(payload.get("score"), (int, float)):
@@ -145,9 +169,7 @@ def run_single(
     metadata["candidate"] = payload.get("candidate") if payload else None
     metadata["status"] = "ok" if result.returncode == 0 else "error"
     metadata["finished_at"] = now_iso()
-    (seed_dir / "metadata.json").write_text(
-        json.dumps(metadata, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-    )
+    json_utils.write_json(seed_dir / "metadata.json", metadata)
     return metadata
 
 
@@ -192,26 +214,33 @@ def main() -> int:
     run_id = args.run_id or dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     run_dir = problem_dir / "compute" / "results" / run_id / "optimizer"
     run_dir.mkdir(parents=True, exist_ok=True)
-    (run_dir / "config.json").write_text(
-        json.dumps(config, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-    )
+    json_utils.write_json(run_dir / "config.json", config)
 
-    results: List[Dict[str, Any]] = []
+    seed_commands: List[Tuple[int, List[str]]] = []
     for idx in range(iterations):
         seed = seed_start + idx
         resolved = resolve_command(command, seed)
         if resolved is None:
             print("ERROR: command must be list or string")
             return 1
-        metadata = run_single(
-            root=root,
-            command=resolved,
-            seed=seed,
-            env={k: str(v) for k, v in env.items()},
-            run_dir=run_dir,
-            dry_run=args.dry_run,
-        )
-        results.append(metadata)
+        seed_commands.append((seed, resolved))
+
+    seed_env = {k: str(v) for k, v in env.items()}
+    # Seeds are independent (own seed_dir); results keep seed order.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            pool.submit(
+                run_single,
+                root=root,
+                command=resolved,
+                seed=seed,
+                env=seed_env,
+                run_dir=run_dir,
+                dry_run=args.dry_run,
+            )
+            for seed, resolved in seed_commands
+        ]
+    results: List[Dict[str, Any]] = [future.result() for future in futures]
 
     valid_results = [
         item for item in results if item.get("valid") and item.get("score") is not None
@@ -229,9 +258,7 @@ def main() -> int:
         "generated_at": now_iso(),
         "top_results": top,
     }
-    (run_dir / "summary.json").write_text(
-        json.dumps(summary, indent=2, sort_keys=False) + "\n", encoding="utf-8"
-    )
+    json_utils.write_json(run_dir / "summary.json", summary)
 
     summary_lines = [
         "# Optimizer Summary",
@@ -5,10 +5,14 @@ from __future__ import annotations
 
 import argparse
 import csv
+import itertools
 import json
 import math
+import operator
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SAMPLE_SIZE = 5
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,7 +45,7 @@ def parse_args() -> argparse.Namespace:
 
 def load_json_series(path: Path) -> Tuple[List[Tuple[int, float]], Optional[str]]:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json.loads(path.read_bytes())
     except Exception as exc:
         return [], f"invalid JSON: {exc}"
 
@@ -83,37 +87,36 @@ def load_csv_series(path: Path) -> Tuple[List[Tuple[int, float]], Optional[str]]
     try:
         with path.open("r", encoding="utf-8") as handle:
             reader = csv.reader(handle)
-            rows = list(reader)
-    except Exception as exc:
-        return [], f"invalid CSV: {exc}"
+            first = next(reader, None)
+            if first is None:
+                return [], "empty CSV"
+
+            header = [col.strip().lower() for col in first]
+            n_idx = None
+            v_idx = None
+            rows: Iterable[List[str]] = itertools.chain([first], reader)
+            if "n" in header and "value" in header:
+                n_idx = header.index("n")
+                v_idx = header.index("value")
+                rows = reader
 
-    if not rows:
-        return [], "empty CSV"
-
-    header = [col.strip().lower() for col in rows[0]]
-    start_idx = 0
-    n_idx = None
-    v_idx = None
-    if "n" in header and "value" in header:
-        n_idx = header.index("n")
-        v_idx = header.index("value")
-        start_idx = 1
-
-    pairs = []
-    for row in rows[start_idx:]:
-        if not row:
-            continue
-        if n_idx is not None and v_idx is not None:
-            n = row[n_idx]
-            v = row[v_idx]
-        else:
-            if len(row) < 2:
-                return [], "CSV rows must have at least two columns"
-            n, v = row[0], row[1]
-        try:
-            pairs.append((int(float(n)), float(v)))
-        except ValueError:
-            return [], "CSV values must be numeric"
+            pairs = []
+            for row in rows:
+                if not row:
+                    continue
+                if n_idx is not None and v_idx is not None:
+                    n = row[n_idx]
+                    v = row[v_idx]
+                else:
+                    if len(row) < 2:
+                        return [], "CSV rows must have at least two columns"
+                    n, v = row[0], row[1]
+                try:
+                    pairs.append((int(float(n)), float(v)))
+                except ValueError:
+                    return [], "CSV values must be numeric"
+    except (OSError, csv.Error, UnicodeDecodeError) as exc:
+        return [], f"invalid CSV: {exc}"
     return pairs, None
 
 
@@ -130,7 +133,7 @@ def load_series(path: Path) -> Tuple[List[Tuple[int, float]], Optional[str]]:
 def differences(values: List[float], order: int) -> List[float]:
     result = list(values)
     for _ in range(order):
-        result = [b - a for a, b in zip(result, result[1:])]
+        result = list(map(operator.sub, result[1:], result))
     return result
 
 
@@ -141,6 +144,44 @@ def is_constant(seq: List[float], tol: float) -> bool:
     return all(abs(item - base) <= tol for item in seq[1:])
 
 
+def constant_differences(values: List[float], tol: float) -> Tuple[bool, bool, bool]:
+    # One pass over the series, equivalent to is_constant on each of the first
+    # three difference sequences but without materializing them.
+    const1 = len(values) >= 3
+    const2 = len(values) >= 4
+    const3 = len(values) >= 5
+    prev = prev1 = prev2 = 0.0
+    base1 = base2 = base3 = 0.0
+    for idx, value in enumerate(values):
+        if idx == 0:
+            prev = value
+            continue
+        diff1 = value - prev
+        prev = value
+        if idx == 1:
+            base1 = prev1 = diff1
+            continue
+        if const1 and not abs(diff1 - base1) <= tol:
+            const1 = False
+        diff2 = diff1 - prev1
+        prev1 = diff1
+        if idx == 2:
+            base2 = prev2 = diff2
+            continue
+        if const2 and not abs(diff2 - base2) <= tol:
+            const2 = False
+        diff3 = diff2 - prev2
+        prev2 = diff2
+        if idx == 3:
+            base3 = diff3
+            continue
+        if const3 and not abs(diff3 - base3) <= tol:
+            const3 = False
+        if not (const1 or const2 or const3):
+            break
+    return const1, const2, const3
+
+
 def ratio_sequence(values: List[float]) -> List[float]:
     ratios = []
     for a, b in zip(values, values[1:]):
@@ -161,13 +202,16 @@ def summarize(
         "max": max(values) if values else None,
     }
 
-    diff1 = differences(values, 1)
-    diff2 = differences(values, 2)
-    diff3 = differences(values, 3)
+    # Samples only need a short prefix; constancy is checked over the whole series.
+    head = values[:SAMPLE_SIZE + 3]
+    diff1 = differences(head, 1)
+    diff2 = differences(diff1, 1)
+    diff3 = differences(diff2, 1)
+    order1, order2, order3 = constant_differences(values, tol)
     summary["diff_constant"] = {
-        "order1": is_constant(diff1, tol),
-        "order2": is_constant(diff2, tol),
-        "order3": is_constant(diff3, tol),
+        "order1": order1,
+        "order2": order2,
+        "order3": order3,
     }
     ratios = ratio_sequence(values)
     summary["ratio_constant"] = is_constant(ratios, tol) if ratios else False
@@ -183,11 +227,11 @@ def summarize(
         guess.append("geometric")
     summary["guesses"] = guess
     summary["diff_samples"] = {
-        "order1": diff1[:5],
-        "order2": diff2[:5],
-        "order3": diff3[:5],
+        "order1": diff1[:SAMPLE_SIZE],
+        "order2": diff2[:SAMPLE_SIZE],
+        "order3": diff3[:SAMPLE_SIZE],
     }
-    summary["ratio_samples"] = ratios[:5] if ratios else []
+    summary["ratio_samples"] = ratios[:SAMPLE_SIZE] if ratios else []
     return summary
 
 
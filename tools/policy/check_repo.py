@@ -3,12 +3,15 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import json
 import re
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+MAX_WORKERS = 8
 ALLOWED_STATES = {
     "partial",
     "solved",
@@ -79,6 +82,12 @@ def resolve_repo_path(root: Path, base_dir: Path, path_str: str) -> Tuple[Option
     return None, "path escapes repo"
 
 
+@functools.lru_cache(maxsize=128)
+def read_evidence_text(path: Path) -> str:
+    # Several evidence entries often point at the same Lean file.
+    return path.read_text(encoding="utf-8")
+
+
 def validate_lean_evidence(
     root: Path,
     problem_dir: Path,
@@ -106,12 +115,12 @@ def validate_lean_evidence(
         return
 
     try:
-        content = resolved.read_text(encoding="utf-8")
+        content = read_evidence_text(resolved)
     except Exception as exc:  # pylint: disable=broad-except
         errors.append(f"evidence[{idx}].file could not be read: {exc}")
         return
 
-    if not re.search(re.escape(theorem), content):
+    if theorem not in content:
         errors.append(
             f"evidence[{idx}].file does not mention theorem name: {theorem}"
         )
@@ -203,6 +212,7 @@ def validate_problem(status_path: Path, root: Path) -> List[str]:
 
 
 def main() -> int:
+    read_evidence_text.cache_clear()
     root = Path(__file__).resolve().parents[2]
     problems_dir, created = ensure_problems_dir(root)
     global_errors: List[str] = []
@@ -239,8 +249,13 @@ def main() -> int:
         for error in global_errors:
             print(f"  - {error}")
 
-    for status_path in status_files:
-        errors = validate_problem(status_path, root)
+    # Validation is read-bound and independent per problem; report in order.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        outcomes = list(
+            pool.map(lambda path: validate_problem(path, root), status_files)
+        )
+
+    for status_path, errors in zip(status_files, outcomes):
         if errors:
             total_errors += len(errors)
             print(f"Errors in {status_path.relative_to(root)}:")
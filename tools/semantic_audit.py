@@ -86,8 +86,7 @@ def write_audit(
     lean_file: Optional[str] = None,
 ) -> Path:
     frozen_path = problem_dir / "statement" / "frozen_v1.md"
-    frozen_text = frozen_path.read_text(encoding="utf-8") if frozen_path.exists() else ""
-    statement_text = solver_scaffold.extract_statement(frozen_text)
+    statement_text = solver_scaffold.load_statement(frozen_path)
 
     resolved_lean = resolve_lean_file(root, problem_id, problem_dir, run_id, lean_file)
     lean_lines = extract_lean_statements(resolved_lean) if resolved_lean else []
@@ -140,10 +140,7 @@ def write_autoplan(
     max_plans: int = 3,
 ) -> Path:
     statement_path = problem_dir / "statement" / "frozen_v1.md"
-    statement_text = (
-        statement_path.read_text(encoding="utf-8") if statement_path.exists() else ""
-    )
-    statement = solver_scaffold.extract_statement(statement_text)
+    statement = solver_scaffold.load_statement(statement_path)
     keywords = literature_scout.extract_keywords(statement, limit=6)
 
     plans = plan_templates(keywords)[: max(1, max_plans)]
@@ -4,12 +4,14 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import datetime as dt
+import functools
 import json
 import os
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 
 import literature_scout
 import llm_utils
@@ -18,6 +20,7 @@ DEFAULT_MAX_PLANS = int(os.getenv("SOLVER_MAX_PLANS", "8"))
 DEFAULT_MAX_LITERATURE = int(os.getenv("SOLVER_MAX_LITERATURE", "8"))
 PLACEHOLDER_RESPONSE = "# Paste ChatGPT Pro output below\n\n"
 PLACEHOLDER_NOTES = "# Notes\n\n"
+LOG_HANDLES: Dict[Path, TextIO] = {}
 
 
 def now_iso() -> str:
@@ -30,6 +33,7 @@ def run_id_now() -> str:
     return dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_problem_id(raw: str) -> Tuple[str, int]:
     match = re.fullmatch(r"[Pp]?(\d+)", raw.strip())
     if not match:
@@ -59,17 +63,43 @@ def read_text(path: Path) -> Optional[str]:
         return None
 
 
+@functools.lru_cache(maxsize=32)
+def read_statement(frozen_path: Path, mtime_ns: int, size: int) -> str:
+    return extract_statement(read_text(frozen_path) or "")
+
+
+def load_statement(frozen_path: Path) -> str:
+    try:
+        stat = frozen_path.stat()
+    except OSError:
+        return ""
+    return read_statement(frozen_path, stat.st_mtime_ns, stat.st_size)
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
 def log_event(root: Path, message: str) -> None:
-    logs_dir = root / "logs"
-    ensure_dir(logs_dir)
-    log_path = logs_dir / "solver.log"
-    timestamp = now_iso()
-    with log_path.open("a", encoding="utf-8", errors="ignore") as handle:
-        handle.write(f"[{timestamp}] {message}\n")
+    # Keep solver.log open for the rest of the process: auto_problem logs from
+    # several tools in one run. Line buffering flushes each event as written.
+    handle = LOG_HANDLES.get(root)
+    if handle is None:
+        logs_dir = root / "logs"
+        ensure_dir(logs_dir)
+        handle = (logs_dir / "solver.log").open(
+            "a", encoding="utf-8", errors="ignore", buffering=1
+        )
+        if not LOG_HANDLES:
+            atexit.register(close_log_handles)
+        LOG_HANDLES[root] = handle
+    handle.write(f"[{now_iso()}] {message}\n")
+
+
+def close_log_handles() -> None:
+    while LOG_HANDLES:
+        _, handle = LOG_HANDLES.popitem()
+        handle.close()
 
 
 def planner_prompt(
@@ -237,10 +267,8 @@ def run_used(run_dir: Path) -> bool:
     return False
 
 
-def resolve_latest_run(runs_dir: Path) -> Optional[str]:
-    latest_path = runs_dir / "latest.json"
-    if not latest_path.exists():
-        return None
+@functools.lru_cache(maxsize=32)
+def read_latest_run(latest_path: Path, mtime_ns: int) -> Optional[str]:
     try:
         payload = json.loads(latest_path.read_text(encoding="utf-8"))
     except Exception:
@@ -249,11 +277,21 @@ def resolve_latest_run(runs_dir: Path) -> Optional[str]:
     return run_id if isinstance(run_id, str) else None
 
 
+def resolve_latest_run(runs_dir: Path) -> Optional[str]:
+    latest_path = runs_dir / "latest.json"
+    try:
+        mtime_ns = latest_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return read_latest_run(latest_path, mtime_ns)
+
+
 def write_latest(runs_dir: Path, run_id: str) -> None:
     payload = {"run_id": run_id, "updated_at": now_iso()}
     (runs_dir / "latest.json").write_text(
         json.dumps(payload, indent=2, sort_keys=False) + "\n", encoding="utf-8"
     )
+    read_latest_run.cache_clear()
 
 
 def ensure_best_dir(problem_dir: Path) -> None:
@@ -360,8 +398,7 @@ def run_scaffold(
 
     frozen_path = problem_dir / "statement" / "frozen_v1.md"
     if statement_text is None:
-        frozen_text = read_text(frozen_path) or ""
-        statement_text = extract_statement(frozen_text)
+        statement_text = load_statement(frozen_path)
 
     input_bundle = build_input_bundle(
         problem_id=problem_id,